@@ -0,0 +1,199 @@
+"""
+API HTTP (ASGI) con los mismos datos filtrados y agregados del dashboard
+
+Rutas (GET o HEAD):
+    /api/summary             Estadísticas, resumen por macrorregión y departamentos
+    /api/municipios.geojson  Municipios filtrados como FeatureCollection
+    /api/version             Versión vigente de los datos
+    /tiles/{z}/{x}/{y}.pbf   Teselas vectoriales (MVT) de los municipios filtrados
+
+Filtros por query string, repitiendo el parámetro para varios valores:
+?alerta=Inmediata&alerta=Urgente&departamento=... (no se separan por coma:
+hay departamentos con coma en el nombre, como "Bogotá, D.C.").
+Mismas reglas que filter_data: un filtro vacío no filtra.
+
+Las respuestas llevan ETag (versión de datos + filtros) y admiten
+If-None-Match (304) y gzip. Uso:
+    uvicorn api:app --port 8000
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from utils.aggregates import get_alert_cube, summary_from_cube
+from utils.cache import ByteBudgetLRU
+from utils.config import API_CACHE_MAX_BYTES, API_FILTER_PARAMS, API_GZIP_MIN_BYTES, CRITICAL_ALERTS
+from utils.data_loader import filter_data, get_data_version, make_filter_key
+from utils.exporters import to_geojson_bytes
+from utils.refresh import get_dataset_store
+from utils.tiles import get_tile, tile_in_range
+
+pd.set_option('mode.copy_on_write', True)
+
+# Cuerpos ya generados por (ETag, codificación); compartidos entre peticiones
+_responses = ByteBudgetLRU(API_CACHE_MAX_BYTES)
+
+
+def _json_bytes(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def summary_payload(df: pd.DataFrame, filter_key: tuple) -> dict:
+    """Resumen de la selección: los mismos agregados que muestra el dashboard"""
+    cube = get_alert_cube(df).select(*filter_key)
+    stats = summary_from_cube(cube)
+    by_region = cube.macro_by_alert()
+    return {
+        'filtros': dict(zip(API_FILTER_PARAMS, map(list, filter_key))),
+        'resumen': {
+            'total_municipios': stats['total_municipios'],
+            'departamentos': stats['departamentos'],
+            'macroregiones': stats['macroregiones'],
+            'por_alerta': {k: int(v) for k, v in stats['por_alerta'].items()},
+            'por_macroregion': {k: int(v) for k, v in stats['por_macroregion'].items()}
+        },
+        'por_region': {
+            macro: {alert: int(n) for alert, n in row.items() if n > 0}
+            for macro, row in by_region.iterrows()
+        },
+        'departamentos': {k: int(v) for k, v in cube.dept_counts().sort_values(ascending=False).items()},
+        'departamentos_criticos': {k: int(v) for k, v in cube.dept_counts_for(CRITICAL_ALERTS).items()}
+    }
+
+
+# Cada ruta: (patrón, tipo de contenido, función (df, filter_key, **parámetros) -> bytes)
+ROUTES = [
+    (re.compile(r'/api/summary'), 'application/json; charset=utf-8',
+     lambda df, key: _json_bytes(summary_payload(df, key))),
+    (re.compile(r'/api/municipios\.geojson'), 'application/geo+json; charset=utf-8',
+     lambda df, key: to_geojson_bytes(filter_data(df, *key))),
+    (re.compile(r'/api/version'), 'application/json; charset=utf-8',
+     lambda df, key: _json_bytes({'data_version': df.attrs.get('data_version', ''),
+                                  'municipios': len(df)})),
+    (re.compile(r'/tiles/(?P<z>\d{1,2})/(?P<x>\d{1,9})/(?P<y>\d{1,9})\.pbf'), 'application/vnd.mapbox-vector-tile',
+     lambda df, key, z, x, y: get_tile(df, int(z), int(x), int(y), key))
+]
+
+
+def match_route(path: str):
+    """Ruta y parámetros para path, o (None, None)"""
+    for route in ROUTES:
+        match = route[0].fullmatch(path)
+        if match:
+            return route, match.groupdict()
+    return None, None
+
+
+def parse_filters(query_string: bytes) -> tuple:
+    """Clave de filtros normalizada (make_filter_key) a partir del query string"""
+    # Un valor por parámetro repetido (?alerta=A&alerta=B), igual que tiles.filter_query
+    params = parse_qs(query_string.decode('latin-1'))
+    return make_filter_key(*(params.get(name, []) for name in API_FILTER_PARAMS))
+
+
+def make_etag(path: str, data_version: str, filter_key: tuple) -> str:
+    digest = hashlib.sha1(repr((path, data_version, filter_key)).encode('utf-8')).hexdigest()[:20]
+    return f'"{data_version}-{digest}"'
+
+
+def accepts_gzip(headers: dict) -> bool:
+    accept = headers.get('accept-encoding', '')
+    return any(part.split(';')[0].strip() in ('gzip', '*') and not part.strip().endswith('q=0')
+               for part in accept.split(','))
+
+
+def etag_matches(headers: dict, etag: str) -> bool:
+    candidates = [tag.strip().removeprefix('W/') for tag in headers.get('if-none-match', '').split(',')]
+    return etag in candidates or '*' in candidates
+
+
+def _render(route, params: dict, etag: str, filter_key: tuple, df: pd.DataFrame, use_gzip: bool) -> tuple:
+    """
+    Cuerpo de la respuesta, cacheado por ETag; se ejecuta fuera del event loop
+
+    Returns:
+        Tupla (cuerpo, codificación): 'gzip' o None
+    """
+    body = _responses.get_or_create((etag, 'identity'), lambda: route[2](df, filter_key, **params))
+    if use_gzip and len(body) >= API_GZIP_MIN_BYTES:
+        return _responses.get_or_create((etag, 'gzip'), lambda: gzip.compress(body, compresslevel=6)), 'gzip'
+    return body, None
+
+
+async def _send(send, status: int, headers: list, body: bytes = b''):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _send_error(send, status: int, message: str):
+    await _send(send, status, [('content-type', 'application/json; charset=utf-8')],
+                _json_bytes({'error': message}))
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Carga anticipada; si falla se reintenta en cada petición
+                try:
+                    await asyncio.to_thread(get_dataset_store().refresh)
+                except Exception:
+                    pass
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path'].rstrip('/') or '/'
+    route, params = match_route(path)
+    if route is None:
+        await _send_error(send, 404, f"Ruta no encontrada: {path}")
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _send_error(send, 405, "Método no permitido")
+        return
+    if 'z' in params and not tile_in_range(*(int(params[k]) for k in ('z', 'x', 'y'))):
+        await _send_error(send, 404, f"Tesela fuera de rango: {path}")
+        return
+
+    store = get_dataset_store()
+    try:
+        await asyncio.to_thread(store.refresh)
+    except Exception:
+        # Igual que el dashboard: se sigue sirviendo la última versión válida
+        pass
+    df = store.df
+    if df is None:
+        await _send_error(send, 503, "Datos no disponibles")
+        return
+
+    headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+    filter_key = parse_filters(scope.get('query_string', b''))
+    etag = make_etag(path, get_data_version(df), filter_key)
+    common = [('etag', etag), ('cache-control', 'no-cache'), ('vary', 'Accept-Encoding'),
+              ('access-control-allow-origin', '*')]
+
+    if etag_matches(headers, etag):
+        await _send(send, 304, common)
+        return
+
+    use_gzip = accepts_gzip(headers)
+    body, encoding = await asyncio.to_thread(_render, route, params, etag, filter_key, df, use_gzip)
+    response_headers = common + [('content-type', route[1]),
+                                 ('content-length', str(len(body)))]
+    if encoding:
+        response_headers.append(('content-encoding', encoding))
+
+    await _send(send, 200, response_headers, b'' if scope['method'] == 'HEAD' else body)
@@ -6,6 +6,10 @@ Sistema de Monitoreo de Riesgos Electorales 2025-2026
 import streamlit as st
 import pandas as pd
 
+# El dataset se comparte entre sesiones: con Copy-on-Write los filtrados y
+# selecciones son vistas perezosas y nunca modifican el original
+pd.set_option('mode.copy_on_write', True)
+
 # Configuración de página (debe ser la primera llamada de Streamlit)
 st.set_page_config(
     page_title="Alerta Electoral N°013-25",
@@ -15,11 +19,34 @@ st.set_page_config(
 )
 
 # Importar componentes
-from utils.data_loader import load_electoral_data, get_summary_stats, filter_data
+from utils.data_loader import filter_data, make_filter_key, get_data_version
+from utils.refresh import get_electoral_data
+from utils.aggregates import get_alert_cube, summary_from_cube
 from components.header import render_header, render_info_banner, render_about
 from components.filters import render_filters, render_export_options
-from components.metrics import render_kpi_cards, render_regional_summary, render_top_departments
-from components.map import render_map
+from components.viewport import render_overview
+from components.admin import render_profiling_panel
+from components.history import render_bulletin_history
+from components.proximity import render_proximity_search
+from components.hotspots import render_hotspots
+from components.table import render_data_table
+from components.panels import panel
+from utils.profiling import start_rerun, stage
+
+# Paneles con widgets propios: al usarlos solo se vuelve a ejecutar el panel.
+# Cada uno recibe como argumentos todas sus entradas:
+#   exportación: filas filtradas y clave de filtros
+#   tabla: dataset completo y clave de filtros (se ordena con su índice)
+#   vista: dataset completo, cubo, filas filtradas, filtros y foco de búsqueda;
+#          el mapa sincronizado limita sus indicadores a lo visible
+#   focos: filas filtradas, filtros y su radio de vecindario
+#   proximidad: dataset completo; historial: boletines en disco
+export_panel = panel('exportacion')(render_export_options)
+overview_panel = panel('vista')(render_overview)
+hotspots_panel = panel('focos')(render_hotspots)
+proximity_panel = panel('proximidad')(render_proximity_search)
+history_panel = panel('historial')(render_bulletin_history)
+table_panel = panel('tabla')(render_data_table)
 
 # CSS personalizado
 st.markdown("""
@@ -80,75 +107,76 @@ def main():
     """
     Función principal de la aplicación
     """
+    profiler = start_rerun()
     
     # === SIDEBAR ===
-    render_about()
+    with stage('about'):
+        render_about()
     
     # === CARGA DE DATOS ===
-    with st.spinner("🔄 Cargando datos electorales..."):
-        df = load_electoral_data()
+    with stage('carga'):
+        with st.spinner("🔄 Cargando datos electorales..."):
+            df = get_electoral_data()
     
     if df.empty:
         st.error("❌ No se pudieron cargar los datos. Verifique el archivo.")
         st.stop()
     
+    # Aviso cuando llega una nueva versión de los datos durante la sesión
+    data_version = get_data_version(df)
+    previous_version = st.session_state.get('data_version')
+    if previous_version and previous_version != data_version:
+        st.toast("🔄 Datos actualizados con la última versión del boletín")
+    st.session_state['data_version'] = data_version
+    
     # === FILTROS ===
-    selected_macro, selected_alerts, selected_dept = render_filters(df)
+    with stage('filtros'):
+        selected_macro, selected_alerts, selected_dept = render_filters(df)
     
     # Aplicar filtros
-    df_filtered = filter_data(df, selected_macro, selected_alerts, selected_dept)
+    with stage('filtrado'):
+        df_filtered = filter_data(df, selected_macro, selected_alerts, selected_dept)
+        filter_key = make_filter_key(selected_macro, selected_alerts, selected_dept)
+    
+    # Cubo de conteos: todas las métricas salen de él, no de las filas
+    with stage('cubo'):
+        cube = get_alert_cube(df)
     
     # Opciones de exportación
-    render_export_options(df_filtered)
+    with st.sidebar:
+        export_panel(df_filtered, cache_key=filter_key)
     
     # === CONTENIDO PRINCIPAL ===
     
     # Header
-    render_header()
-    
-    # Banner informativo
-    stats = get_summary_stats(df)
-    render_info_banner(
-        total_municipios=stats['total_municipios'],
-        total_departamentos=stats['departamentos']
-    )
-    
-    st.markdown("---")
-    
-    # KPI Cards
-    render_kpi_cards(df_filtered)
+    with stage('encabezado'):
+        render_header()
+        
+        # Banner informativo
+        stats = summary_from_cube(cube)
+        render_info_banner(
+            total_municipios=stats['total_municipios'],
+            total_departamentos=stats['departamentos']
+        )
     
     st.markdown("---")
     
-    # Mapa principal
-    render_map(df_filtered)
+    # KPIs, mapa principal y análisis regional/departamental (sincronizables con la vista del mapa)
+    overview_panel(df, df_filtered, cube, filter_key, focus=st.session_state.get('map_focus'))
     
     st.markdown("---")
     
-    # Análisis regional y departamental
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        render_regional_summary(df_filtered)
+    # Focos de alertas críticas de la selección
+    hotspots_panel(df_filtered, cache_key=filter_key)
     
-    with col2:
-        render_top_departments(df_filtered, n=10)
+    # Consultas espaciales sobre el dataset completo
+    proximity_panel(df)
     
-    st.markdown("---")
+    # Comparación con boletines anteriores
+    history_panel()
     
     # Tabla detallada
-    with st.expander("📋 Ver Tabla Completa de Datos", expanded=False):
-        st.dataframe(
-            df_filtered[[
-                'Departamento', 
-                'Municipio', 
-                'Macrorregion', 
-                'Llamada a la acción',
-                'Codigo Divipola'
-            ]].sort_values(['Departamento', 'Municipio']),
-            use_container_width=True,
-            height=400
-        )
+    table_panel(df, cache_key=filter_key)
     
     # Footer
     st.markdown("---")
@@ -159,6 +187,11 @@ def main():
         Desarrollado por: Hermes Yate Bonilla
     </div>
     """, unsafe_allow_html=True)
+    
+    # Tiempos del rerun: log estructurado y panel de administración opcional
+    profiler.metric('filas_filtradas', len(df_filtered))
+    profiler.log()
+    render_profiling_panel(profiler)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+Benchmarks de las rutas críticas del dashboard
+"""
@@ -0,0 +1,194 @@
+"""
+Benchmark de las etapas del dashboard, sin navegador
+
+Mide tiempo y pico de memoria (tracemalloc) de carga, filtrado, métricas
+y construcción de mapas sobre datasets sintéticos de distintos tamaños.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 1000000 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+# Silenciar avisos de Streamlit al usar funciones cacheadas fuera de `streamlit run`
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+warnings.filterwarnings('ignore')
+
+from utils.aggregates import AlertCube, summary_from_cube
+from utils.cache import cache_path, file_hash, write_cached_frame
+from utils.config import CACHE_DIR, CRITICAL_ALERTS
+from utils.data_loader import compact_frame, filter_data, load_electoral_data
+from utils.filter_index import FilterIndex
+from components.map import create_electoral_map, create_heat_map, map_to_html
+from .synthetic import generate_alerts
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def measure(func, repeat: int = 1, memory: bool = True) -> dict:
+    """
+    Ejecuta func y devuelve el mejor tiempo de `repeat` corridas y el pico de memoria
+
+    La memoria se mide en una corrida adicional, para que tracemalloc no
+    distorsione los tiempos.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_bytes': peak, 'result': result}
+
+
+def prepare_workbook(df, n_rows: int, excel_max_rows: int, seed: int) -> str:
+    """
+    Deja en el directorio actual un libro para load_electoral_data
+
+    Hasta excel_max_rows se escribe un Excel real (con coordenadas como
+    texto, igual que el original), regenerado con la misma semilla que df.
+    Por encima, escribir el .xlsx tomaría minutos: se crea un archivo
+    testigo y se precarga su caché Parquet.
+    """
+    os.makedirs('data', exist_ok=True)
+    path = os.path.join('data', f'synthetic_{n_rows}.xlsx')
+
+    if n_rows <= excel_max_rows:
+        text = generate_alerts(n_rows, seed=seed, as_text_coords=True)
+        text.to_excel(path, index=False, engine='openpyxl')
+    else:
+        with open(path, 'w') as fh:
+            fh.write(f'synthetic {n_rows}')
+        write_cached_frame(compact_frame(df.copy()), cache_path(path, file_hash(path)), {'dropped': 0})
+    return path
+
+
+def warm_up_maps(seed: int):
+    """
+    Construye mapas descartables de cada tipo antes de medir
+
+    folium y sus plantillas se cargan de forma diferida al dibujar el primer
+    mapa; sin este paso la primera etapa de mapa mediría esa importación.
+    """
+    sample = compact_frame(generate_alerts(50, seed=seed))
+    for m in (create_electoral_map(sample), create_electoral_map(sample, clustered=True),
+              create_heat_map(sample)):
+        map_to_html(m)
+
+
+def run_size(n_rows: int, args) -> list:
+    """Mide todas las etapas para un tamaño de dataset"""
+    results = []
+
+    def record(stage, func, **extra):
+        stats = measure(func, repeat=args.repeat, memory=not args.no_memory)
+        row = {'rows': n_rows, 'stage': stage, 'seconds': stats['seconds'],
+               'peak_bytes': stats['peak_bytes'], **extra}
+        results.append(row)
+        print(format_row(row), flush=True)
+        return stats['result']
+
+    df = generate_alerts(n_rows, seed=args.seed)
+    path = prepare_workbook(df, n_rows, args.excel_max_rows, args.seed)
+    load = load_electoral_data
+
+    if n_rows <= args.excel_max_rows:
+        def load_cold():
+            shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            return load(path)
+        record('load_excel', load_cold)
+
+    data = record('load_parquet', lambda: load(path))
+
+    record('filter_index_build', lambda: FilterIndex(data))
+    macros = sorted(data['Macrorregion'].unique())
+    depts = sorted(data['Departamento'].unique())
+    selections = [
+        (macros[:1], None, None),
+        (None, CRITICAL_ALERTS, None),
+        (macros[:3], CRITICAL_ALERTS, depts[:5])
+    ]
+    filter_data(data)  # Construye y cachea el índice de la versión de datos
+    record('filter_data', lambda: [filter_data(data, *sel) for sel in selections],
+           note=f'{len(selections)} selecciones')
+
+    cube = record('cube_build', lambda: AlertCube.from_frame(data))
+
+    def metrics():
+        for sel in selections:
+            sub = cube.select(*sel)
+            summary_from_cube(sub)
+            sub.macro_by_alert()
+            sub.dept_counts_for(CRITICAL_ALERTS).head(10)
+    record('metrics', metrics, note=f'{len(selections)} selecciones')
+
+    if n_rows <= args.max_map_rows:
+        html = record('map_points', lambda: map_to_html(create_electoral_map(data)))
+        results[-1]['html_bytes'] = len(html)
+        html = record('map_clusters', lambda: map_to_html(create_electoral_map(data, clustered=True)))
+        results[-1]['html_bytes'] = len(html)
+    html = record('heat_map', lambda: map_to_html(create_heat_map(data)))
+    results[-1]['html_bytes'] = len(html)
+
+    return results
+
+
+def format_row(row: dict) -> str:
+    peak = f"{row['peak_bytes'] / 2**20:9.1f} MiB" if row['peak_bytes'] is not None else '        - '
+    return f"{row['rows']:>10,}  {row['stage']:<20} {row['seconds'] * 1000:12.2f} ms  {peak}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Tamaños de dataset (filas)')
+    parser.add_argument('--repeat', type=int, default=1, help='Corridas por etapa (se toma la mejor)')
+    parser.add_argument('--seed', type=int, default=13)
+    parser.add_argument('--excel-max-rows', type=int, default=20_000,
+                        help='Tamaño máximo para el que se escribe y lee un .xlsx real')
+    parser.add_argument('--max-map-rows', type=int, default=200_000,
+                        help='Tamaño máximo para medir el mapa de marcadores')
+    parser.add_argument('--no-memory', action='store_true', help='No medir pico de memoria')
+    parser.add_argument('--json', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args(argv)
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    all_results = []
+    print(f"{'filas':>10}  {'etapa':<20} {'tiempo':>15}  {'pico memoria':>13}")
+    warm_up_maps(args.seed)
+
+    # Todo se escribe en un directorio temporal (incluida la caché Parquet)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='alerta-bench-') as workdir:
+        os.chdir(workdir)
+        try:
+            for n_rows in args.sizes:
+                all_results.extend(run_size(n_rows, args))
+        finally:
+            os.chdir(cwd)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as fh:
+            json.dump(all_results, fh, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
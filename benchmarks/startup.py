@@ -0,0 +1,93 @@
+"""
+Benchmark de arranque en frío: importación de app.py en un proceso nuevo
+
+Cada corrida lanza un intérprete limpio que importa app.py (sin ejecutar
+main) y mide el tiempo de importación y el del proceso completo. Comprueba
+además que las bibliotecas diferidas (folium, streamlit_folium, openpyxl)
+no se cargaron y mide cuánto habrían costado.
+
+Sale con código 1 si la mediana supera el presupuesto o si alguna
+biblioteca diferida se importó al arrancar.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --budget-ms 1500 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFERRED_MODULES = ['folium', 'folium.plugins', 'branca', 'streamlit_folium', 'openpyxl']
+
+# Presupuesto de importación de app.py (mediana), en milisegundos
+DEFAULT_BUDGET_MS = 1500
+
+_PROBE = """
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+start = time.perf_counter()
+for name in {deferred!r}:
+    __import__(name)
+deferred = time.perf_counter() - start
+print(json.dumps({{'import_ms': imported * 1000, 'deferred_ms': deferred * 1000, 'loaded': loaded}}))
+"""
+
+
+def run_once(root: str) -> dict:
+    """Una importación en frío en un intérprete nuevo"""
+    env = dict(os.environ, STREAMLIT_LOGGER_LEVEL='error', PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(deferred=DEFERRED_MODULES)],
+        cwd=root, env=env, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    # Hasta tener app.py importado: sin la carga posterior de las diferidas
+    result['process_ms'] = (time.perf_counter() - start) * 1000 - result['deferred_ms']
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Procesos a lanzar (se reporta la mediana)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Tiempo máximo de importación de app.py (mediana)')
+    parser.add_argument('--json', help='Guardar resultados en este archivo JSON')
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Una corrida previa descartada: compila los .pyc y calienta la caché del disco
+    run_once(root)
+    runs = [run_once(root) for _ in range(args.repeat)]
+
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key in ('import_ms', 'process_ms', 'deferred_ms')
+    }
+    loaded = sorted({name for run in runs for name in run['loaded']})
+    summary.update(loaded=loaded, budget_ms=args.budget_ms, repeat=args.repeat)
+
+    print(f"importación de app.py   {summary['import_ms']:10.1f} ms  (presupuesto {args.budget_ms:,.0f} ms)")
+    print(f"proceso hasta app.py    {summary['process_ms']:10.1f} ms")
+    print(f"bibliotecas diferidas   {summary['deferred_ms']:10.1f} ms  (se cargan al dibujar el mapa o exportar)")
+    if loaded:
+        print(f"cargadas al arrancar: {', '.join(loaded)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'summary': summary, 'runs': runs}, fh, indent=2, ensure_ascii=False)
+
+    return 0 if summary['import_ms'] <= args.budget_ms and not loaded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Generador de datasets sintéticos con el esquema del libro de alertas
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.config import MACROREGIONES
+
+# Distribución aproximada de niveles en el boletín N°013-25
+ALERT_SHARES = {
+    'Inmediata': 0.055,
+    'Urgente': 0.145,
+    'Prioritaria': 0.38,
+    'Observación permanente': 0.19,
+    'Ordinaria': 0.23
+}
+
+# Extensión aproximada del territorio continental
+LAT_RANGE = (-4.2, 12.5)
+LON_RANGE = (-79.0, -67.0)
+
+
+def generate_alerts(n_rows: int, n_departments: int = 33, seed: int = 13,
+                    as_text_coords: bool = False) -> pd.DataFrame:
+    """
+    Genera un dataset de alertas sintético
+
+    Los municipios se distribuyen alrededor del centro de su departamento y
+    cada departamento pertenece a una macrorregión, como en los datos reales.
+
+    Args:
+        n_rows: Número de municipios (filas)
+        n_departments: Número de departamentos
+        seed: Semilla del generador aleatorio
+        as_text_coords: Coordenadas como texto con coma decimal (como el Excel de origen)
+    """
+    rng = np.random.default_rng(seed)
+
+    dept_names = np.array([f"Departamento {i + 1:02d}" for i in range(n_departments)])
+    dept_macro = np.array(MACROREGIONES)[np.arange(n_departments) % len(MACROREGIONES)]
+    dept_lat = rng.uniform(*LAT_RANGE, n_departments)
+    dept_lon = rng.uniform(*LON_RANGE, n_departments)
+
+    dept = rng.integers(0, n_departments, n_rows)
+    alerts = np.array(list(ALERT_SHARES))
+    shares = np.array(list(ALERT_SHARES.values()))
+
+    lat = np.clip(dept_lat[dept] + rng.normal(0, 0.6, n_rows), *LAT_RANGE)
+    lon = np.clip(dept_lon[dept] + rng.normal(0, 0.6, n_rows), *LON_RANGE)
+    codes = (dept + 1) * 1_000_000 + np.arange(n_rows)
+
+    df = pd.DataFrame({
+        'Codigo Divipola': codes,
+        'Departamento': dept_names[dept],
+        'Municipio': np.char.add('Municipio ', np.arange(n_rows).astype(str)),
+        'Macrorregion': dept_macro[dept],
+        'Llamada a la acción': rng.choice(alerts, n_rows, p=shares / shares.sum()),
+        'Código Municipio': codes % 1_000_000,
+        'Longitud': np.round(lon, 6),
+        'Latitud': np.round(lat, 6)
+    })
+
+    if as_text_coords:
+        for col in ('Latitud', 'Longitud'):
+            df[col] = df[col].astype(str).str.replace('.', ',', regex=False)
+
+    return df
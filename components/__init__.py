@@ -1,22 +1,30 @@
 # components/__init__.py
 """
 Componentes modulares del dashboard electoral
+
+Los nombres se resuelven al primer uso (PEP 562): importar un componente
+no carga los demás ni sus dependencias pesadas.
 """
 
-from .header import render_header, render_info_banner, render_about
-from .metrics import render_kpi_cards, render_regional_summary, render_top_departments
-from .map import render_map, create_electoral_map
-from .filters import render_filters, render_export_options
+import importlib
+
+_EXPORTS = {
+    'render_header': '.header',
+    'render_info_banner': '.header',
+    'render_about': '.header',
+    'render_kpi_cards': '.metrics',
+    'render_regional_summary': '.metrics',
+    'render_top_departments': '.metrics',
+    'render_map': '.map',
+    'create_electoral_map': '.map',
+    'render_filters': '.filters',
+    'render_export_options': '.filters',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'render_header',
-    'render_info_banner',
-    'render_about',
-    'render_kpi_cards',
-    'render_regional_summary',
-    'render_top_departments',
-    'render_map',
-    'create_electoral_map',
-    'render_filters',
-    'render_export_options'
-]
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,40 @@
+import os
+import streamlit as st
+import pandas as pd
+from utils.config import ADMIN_QUERY_PARAM
+from utils.profiling import RerunProfiler
+
+def is_admin_mode() -> bool:
+    """
+    Indica si se muestran las herramientas de administración
+    
+    Se activan con ?admin=1 en la URL o con la variable de entorno ALERTA_ADMIN=1.
+    """
+    return (
+        st.query_params.get(ADMIN_QUERY_PARAM) == '1'
+        or os.environ.get('ALERTA_ADMIN') == '1'
+    )
+
+
+def render_profiling_panel(profiler: RerunProfiler):
+    """
+    Panel lateral con los tiempos por etapa del último rerun
+    """
+    if not is_admin_mode():
+        return
+    
+    data = profiler.as_dict()
+    
+    with st.sidebar.expander("⏱️ Rendimiento del rerun", expanded=True):
+        st.metric("Tiempo total", f"{data['total_ms']:,.0f} ms")
+        
+        stages = pd.DataFrame(
+            list(data['stages_ms'].items()),
+            columns=['Etapa', 'ms']
+        ).sort_values('ms', ascending=False)
+        
+        st.dataframe(stages, use_container_width=True, hide_index=True)
+        
+        if data['metrics']:
+            st.caption("Métricas")
+            st.json(data['metrics'], expanded=False)
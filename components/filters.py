@@ -1,6 +1,20 @@
 import streamlit as st
 import pandas as pd
-from utils.config import ALERT_ICONS, ALERT_PRIORITY
+from utils.cache import ByteBudgetLRU
+from utils.config import ALERT_ICONS, ALERT_PRIORITY, EXPORT_CACHE_MAX_BYTES
+from utils.data_loader import get_data_version
+from utils.exporters import EXPORT_FORMATS
+from utils.search import get_place_index
+
+
+def _jump_to_municipio(matches: dict):
+    """Filtra por el departamento del municipio elegido y centra el mapa en él"""
+    match = matches.get(st.session_state.get('ir_municipio'))
+    if match is None:
+        return
+    st.session_state['filtro_departamentos'] = [match['Departamento']]
+    st.session_state['map_focus'] = match
+
 
 def render_filters(df: pd.DataFrame) -> tuple:
     """
@@ -52,23 +66,56 @@ def render_filters(df: pd.DataFrame) -> tuple:
     # Filtro por Departamento
     st.sidebar.markdown("### 🏛️ Departamento")
     
-    # Búsqueda de departamento
-    search_dept = st.sidebar.text_input(
-        "Buscar departamento:",
+    # Búsqueda aproximada (sin tildes, tolera errores) en el índice de lugares
+    search_place = st.sidebar.text_input(
+        "Buscar departamento o municipio:",
         placeholder="Escriba para buscar..."
     )
     
     dept_options = sorted(df['Departamento'].unique())
+    current_dept = st.session_state.get('filtro_departamentos') or []
     
-    if search_dept:
-        dept_options = [d for d in dept_options if search_dept.lower() in d.lower()]
+    if search_place:
+        index = get_place_index(df)
+        found = [m.name for m in index.search(search_place, kind='departamento')]
+        # Las opciones ya seleccionadas se conservan aunque no coincidan
+        dept_options = found + [d for d in current_dept if d not in found]
+        
+        municipios = index.search(search_place, kind='municipio')
+        if municipios:
+            rows = df.iloc[[m.position for m in municipios]]
+            matches = {
+                m.label: {
+                    'Municipio': m.name,
+                    'Departamento': m.department,
+                    'Codigo Divipola': int(row['Codigo Divipola']),
+                    'Latitud': float(row['Latitud']),
+                    'Longitud': float(row['Longitud'])
+                }
+                for m, (_, row) in zip(municipios, rows.iterrows())
+            }
+            st.sidebar.selectbox(
+                "Ir a municipio:",
+                options=list(matches),
+                index=None,
+                key='ir_municipio',
+                placeholder="Seleccione para filtrar y centrar el mapa",
+                on_change=_jump_to_municipio,
+                args=(matches,)
+            )
     
     selected_dept = st.sidebar.multiselect(
         "Seleccione departamentos:",
         options=dept_options,
-        default=None
+        default=None,
+        key='filtro_departamentos'
     )
     
+    # El foco del mapa se descarta si su departamento deja de estar filtrado
+    focus = st.session_state.get('map_focus')
+    if focus and focus['Departamento'] not in selected_dept:
+        del st.session_state['map_focus']
+    
     st.sidebar.markdown("---")
     
     # Botón de reset
@@ -90,40 +137,59 @@ def render_filters(df: pd.DataFrame) -> tuple:
     return selected_macro, selected_alerts, selected_dept
 
 
-def render_export_options(df: pd.DataFrame):
+@st.cache_resource
+def get_export_cache() -> ByteBudgetLRU:
+    """Caché LRU de archivos exportados, compartida por todas las sesiones"""
+    return ByteBudgetLRU(EXPORT_CACHE_MAX_BYTES)
+
+
+def render_export_options(df: pd.DataFrame, cache_key: tuple = None):
     """
     Opciones para exportar datos filtrados
+    
+    Los archivos solo se generan cuando el usuario los solicita y se
+    reutilizan mientras no cambien los datos ni los filtros.
+    
+    Se dibuja en el contenedor actual (el sidebar, desde app.py).
+    
+    Args:
+        df: DataFrame filtrado
+        cache_key: Clave de filtros (make_filter_key)
     """
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📥 Exportar Datos")
+    st.markdown("---")
+    st.markdown("### 📥 Exportar Datos")
     
-    col1, col2 = st.sidebar.columns(2)
+    export_key = (get_data_version(df), cache_key)
     
-    with col1:
-        # Exportar a CSV
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📄 CSV",
-            data=csv,
-            file_name="alerta_electoral_filtrado.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+    cols = st.columns(len(EXPORT_FORMATS))
     
-    with col2:
-        # Exportar a Excel
-        from io import BytesIO
-        buffer = BytesIO()
-        df.to_excel(buffer, index=False, engine='openpyxl')
-        excel_data = buffer.getvalue()
+    for col, (fmt, spec) in zip(cols, EXPORT_FORMATS.items()):
+        with col:
+            if st.button(spec['label'], key=f"export_{fmt}", use_container_width=True):
+                st.session_state['export_request'] = (fmt, export_key)
+    
+    # Solo se atiende la solicitud hecha con los filtros vigentes
+    request = st.session_state.get('export_request')
+    if request and request[1] == export_key:
+        fmt = request[0]
+        spec = EXPORT_FORMATS[fmt]
+        
+        with st.spinner("Generando archivo..."):
+            if cache_key is None:
+                data = spec['writer'](df)
+            else:
+                data = get_export_cache().get_or_create(
+                    (fmt,) + export_key,
+                    lambda: spec['writer'](df)
+                )
         
         st.download_button(
-            label="📊 Excel",
-            data=excel_data,
-            file_name="alerta_electoral_filtrado.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            label=f"⬇️ Descargar {spec['label']}",
+            data=data,
+            file_name=spec['file_name'],
+            mime=spec['mime'],
             use_container_width=True
         )
     
     # Resumen de registros
-    st.sidebar.metric("Registros visibles", len(df))
\ No newline at end of file
+    st.metric("Registros visibles", len(df))
\ No newline at end of file
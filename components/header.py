@@ -1,5 +1,6 @@
 import streamlit as st
 from datetime import datetime as dt
+from utils.config import CURRENT_BULLETIN
 
 def render_header():
     """
@@ -30,7 +31,7 @@ def render_header():
                     font-weight: 600;
                     letter-spacing: -0.5px;
                 ">
-                    Alerta Temprana Electoral N°013-25
+                    Alerta Temprana Electoral {CURRENT_BULLETIN}
                 </h1>
                 <p style="
                     margin: 8px 0 0 0;
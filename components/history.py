@@ -0,0 +1,49 @@
+import streamlit as st
+import pandas as pd
+from utils.config import CRITICAL_ALERTS, HISTORY_DIR
+from utils.history import HistoryStore
+
+@st.cache_data(show_spinner=False)
+def _escalated(root: str, base_id: str, bulletin_ids: tuple) -> pd.DataFrame:
+    return HistoryStore(root).escalated_since(base_id, bulletin_ids[-1])
+
+
+@st.cache_data(show_spinner=False)
+def _critical_trend(root: str, bulletin_ids: tuple) -> pd.DataFrame:
+    return HistoryStore(root).department_trend(alerts=CRITICAL_ALERTS)
+
+
+def render_bulletin_history(root: str = HISTORY_DIR, top: int = 8):
+    """
+    Comparación entre boletines: municipios que escalaron y tendencia departamental
+    
+    Args:
+        root: Directorio del historial de boletines
+        top: Departamentos a graficar (los de más alertas críticas en el último boletín)
+    """
+    bulletin_ids = tuple(HistoryStore(root).bulletin_ids())
+    
+    with st.expander("📈 Evolución entre boletines", expanded=False):
+        if len(bulletin_ids) < 2:
+            st.info(
+                "Se requieren al menos dos boletines en el historial. "
+                "Regístrelos con: `python -m utils.history add <boletín> <archivo.xlsx>`"
+            )
+            return
+        
+        base_id = st.selectbox(
+            "Comparar el último boletín contra:",
+            options=list(bulletin_ids[:-1]),
+            index=len(bulletin_ids) - 2
+        )
+        
+        escalated = _escalated(root, base_id, bulletin_ids)
+        st.metric(f"Municipios con alerta agravada desde {base_id}", f"{len(escalated):,}")
+        if not escalated.empty:
+            st.dataframe(escalated, use_container_width=True, hide_index=True, height=300)
+        
+        trend = _critical_trend(root, bulletin_ids)
+        if not trend.empty:
+            leaders = trend.iloc[-1].sort_values(ascending=False).head(top).index
+            st.caption("Alertas críticas por boletín (departamentos con más alertas en el último boletín)")
+            st.line_chart(trend[leaders], height=300)
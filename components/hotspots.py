@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+from utils.config import ALERT_COLORS, COLOMBIA_CENTER, DEFAULT_ZOOM, HOTSPOT_CONFIG, MAP_CONFIG
+from utils.data_loader import get_data_version
+from utils.hotspots import analyze_hotspots
+from .map import get_map_html, show_map_html
+
+# Intensidad del marcador según la confianza del foco
+CONFIDENCE_COLORS = {'99.9%': '#B71C1C', '99.0%': '#E53935', '95.0%': '#FB8C00', '90.0%': '#FDD835'}
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _hotspots(_df: pd.DataFrame, data_version: str, cache_key: tuple, band_km: int) -> tuple:
+    """Focos por versión de datos y filtros, compartidos entre sesiones"""
+    return analyze_hotspots(_df, band_km=band_km)
+
+
+def create_hotspot_map(points: pd.DataFrame, clusters: pd.DataFrame) -> 'folium.Map':
+    """
+    Mapa de focos: municipios calientes por confianza y un círculo por foco
+    """
+    import folium
+    
+    m = folium.Map(
+        location=COLOMBIA_CENTER,
+        zoom_start=DEFAULT_ZOOM,
+        tiles=MAP_CONFIG['tiles']
+    )
+    
+    for row in clusters.to_dict('records'):
+        folium.Circle(
+            location=[row['Latitud'], row['Longitud']],
+            radius=15000 + 2500 * row['Municipios'],
+            color=ALERT_COLORS['Inmediata'],
+            weight=1,
+            fill=True,
+            fill_opacity=0.08,
+            tooltip=f"Foco {row['Foco']}: {row['Municipios']} municipios, z máx. {row['z máximo']}"
+        ).add_to(m)
+    
+    for row in points.itertuples(index=False):
+        color = CONFIDENCE_COLORS.get(row.Confianza, '#9E9E9E')
+        folium.CircleMarker(
+            location=[float(row.Latitud), float(row.Longitud)],
+            radius=5,
+            color=color,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.8,
+            weight=1,
+            tooltip=f"{row.Municipio} ({row.Departamento}) - Foco {row.Foco}, z = {row.z}"
+        ).add_to(m)
+    
+    return m
+
+
+def render_hotspots(df: pd.DataFrame, cache_key: tuple = None):
+    """
+    Focos estadísticamente significativos de alertas críticas (Gi*)
+    
+    Args:
+        df: DataFrame filtrado
+        cache_key: Clave de filtros (make_filter_key)
+    """
+    with st.expander("🔥 Focos de alertas críticas", expanded=False):
+        band_km = st.select_slider(
+            "Radio de vecindario (km)",
+            options=[20, 30, 40, 60, 80],
+            value=HOTSPOT_CONFIG['band_km'],
+            help="Getis-Ord Gi*: compara las alertas críticas alrededor de cada municipio con las del conjunto filtrado"
+        )
+        
+        points, clusters = _hotspots(df, get_data_version(df), cache_key, band_km)
+        
+        if clusters.empty:
+            st.info("No se detectan focos significativos con la selección actual")
+            return
+        
+        st.caption(
+            f"{len(clusters)} focos con {len(points)} municipios "
+            f"(confianza ≥ {1 - HOTSPOT_CONFIG['alpha']:.0%}, corregida por comparaciones múltiples)"
+        )
+        st.dataframe(clusters.drop(columns=['Latitud', 'Longitud']), use_container_width=True, hide_index=True, height=250)
+        
+        show_map_html(get_map_html(
+            f'hotspots_{band_km}', lambda d: create_hotspot_map(points, clusters), df, cache_key
+        ))
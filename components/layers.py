@@ -0,0 +1,409 @@
+"""
+Capas folium vectorizadas para el mapa electoral
+"""
+
+import json
+
+import pandas as pd
+from branca.element import Template
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+
+POINT_COLUMNS = {
+    'lat': 'Latitud',
+    'lon': 'Longitud',
+    'municipio': 'Municipio',
+    'departamento': 'Departamento',
+    'macro': 'Macrorregion',
+    'codigo': 'Codigo Divipola'
+}
+
+
+def columns_payload(df: pd.DataFrame, columns: dict = POINT_COLUMNS) -> str:
+    """
+    Serializa columnas del DataFrame como arreglos JSON paralelos
+
+    Se convierte columna a columna (sin objetos por fila) y se escapa
+    '</' para poder incrustar el resultado dentro de un <script>. Las
+    columnas decimales se redondean a 6 cifras (~0,1 m).
+    """
+    payload = {}
+    for key, col in columns.items():
+        values = df[col]
+        if pd.api.types.is_float_dtype(values):
+            payload[key] = values.to_numpy(dtype='float64').round(6).tolist()
+        else:
+            payload[key] = values.tolist()
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+class AlertPointLayer(Layer):
+    """
+    Capa de puntos para un nivel de alerta, dibujada en canvas
+
+    Todos los municipios del grupo viajan como un único bloque de arreglos
+    columnares; los marcadores, popups y tooltips se crean en el navegador.
+    Hereda de Layer, por lo que aparece en el LayerControl igual que un
+    FeatureGroup.
+
+    Args:
+        df: DataFrame con los municipios del nivel de alerta
+        alert_type: Nombre del nivel (se usa como nombre de la capa)
+        color: Color de borde y relleno de los marcadores
+        radius: Radio de los marcadores en píxeles
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var data = {{ this.payload }};
+                var renderer = L.canvas({padding: 0.5});
+                var group = L.featureGroup();
+                var style = {
+                    renderer: renderer,
+                    radius: {{ this.radius }},
+                    color: {{ this.color|tojson }},
+                    fillColor: {{ this.color|tojson }},
+                    fill: true,
+                    fillOpacity: 0.7,
+                    weight: 2
+                };
+                var alertType = {{ this.alert_type|tojson }};
+                for (var i = 0; i < data.lat.length; i++) {
+                    var marker = L.circleMarker([data.lat[i], data.lon[i]], style);
+                    marker.bindTooltip(data.municipio[i] + ' - ' + alertType, {sticky: true});
+                    marker.bindPopup((function(j) {
+                        return function() {
+                            return '<div style="font-family: Arial; width: 200px;">'
+                                + '<h4 style="margin: 0; color: ' + style.color + ';">' + data.municipio[j] + '</h4>'
+                                + '<hr style="margin: 5px 0;">'
+                                + '<p style="margin: 3px 0;"><b>Departamento:</b> ' + data.departamento[j] + '</p>'
+                                + '<p style="margin: 3px 0;"><b>Macrorregión:</b> ' + data.macro[j] + '</p>'
+                                + '<p style="margin: 3px 0;"><b>Alerta:</b> ' + alertType + '</p>'
+                                + '<p style="margin: 3px 0; font-size: 10px; color: gray;">Código: ' + data.codigo[j] + '</p>'
+                                + '</div>';
+                        };
+                    })(i), {maxWidth: 250});
+                    group.addLayer(marker);
+                }
+                return group;
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, df: pd.DataFrame, alert_type: str, color: str,
+                 radius: int = 7, show: bool = True):
+        super().__init__(name=alert_type, overlay=True, control=True, show=show)
+        self._name = 'AlertPointLayer'
+        self.alert_type = alert_type
+        self.color = color
+        self.radius = radius
+        self.payload = columns_payload(df)
+
+
+class AlertClusterLayer(Layer):
+    """
+    Capa de grupos de municipios con nivel de detalle según el zoom
+
+    Recibe los grupos de los zooms gruesos (build_cluster_levels) y los
+    datos por municipio (cluster_points) una sola vez; el navegador solo
+    dibuja los del nivel de zoom vigente y los reemplaza al acercarse.
+    Desde el zoom de puntos se dibuja cada municipio. Cada grupo toma el
+    color de su peor alerta; un clic sobre un grupo acerca el mapa a esa
+    zona.
+
+    Args:
+        levels: {zoom: arreglos columnares} de build_cluster_levels
+        points: Arreglos columnares por municipio de cluster_points
+        alerts: Niveles de alerta en el orden de los índices de 'alert'
+        colors: Color de cada nivel, en el mismo orden
+        name: Nombre de la capa en el LayerControl
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var data = {{ this.payload }};
+                var pts = data.points;
+                var renderer = L.canvas({padding: 0.5});
+                var group = L.featureGroup();
+                var map = null;
+                var current = null;
+
+                function levelFor(zoom) {
+                    zoom = Math.max(data.minZoom, Math.round(zoom));
+                    return zoom >= data.pointsZoom ? data.pointsZoom : zoom;
+                }
+
+                function addMarker(lat, lon, alert, count, tooltip) {
+                    var color = data.colors[alert] || '#808080';
+                    var marker = L.circleMarker([lat, lon], {
+                        renderer: renderer,
+                        radius: 7 + 3 * Math.log2(count),
+                        color: color,
+                        fillColor: color,
+                        fill: true,
+                        fillOpacity: 0.7,
+                        weight: 2
+                    });
+                    marker.bindTooltip(tooltip, {sticky: true});
+                    group.addLayer(marker);
+                    return marker;
+                }
+
+                function addPoint(j) {
+                    addMarker(pts.lat[j], pts.lon[j], pts.alert[j], 1,
+                              '<b>' + pts.label[j] + '</b> - ' + (data.alerts[pts.alert[j]] || ''));
+                }
+
+                function describe(lv, i) {
+                    var html = '<b>' + lv.count[i] + ' municipios</b>';
+                    for (var k = 0; k < data.alerts.length; k++) {
+                        if (lv.breakdown[i][k] > 0) {
+                            html += '<br><span style="color: ' + data.colors[k] + ';">&#9679;</span> '
+                                + data.alerts[k] + ': ' + lv.breakdown[i][k];
+                        }
+                    }
+                    return html;
+                }
+
+                function draw() {
+                    var zoom = levelFor(map.getZoom());
+                    if (zoom === current) { return; }
+                    current = zoom;
+                    group.clearLayers();
+                    if (zoom === data.pointsZoom) {
+                        for (var j = 0; j < pts.lat.length; j++) { addPoint(j); }
+                        return;
+                    }
+                    var lv = data.levels[zoom];
+                    for (var s = 0; s < lv.single.length; s++) { addPoint(lv.single[s]); }
+                    for (var i = 0; i < lv.lat.length; i++) {
+                        addMarker(lv.lat[i], lv.lon[i], lv.alert[i], lv.count[i], describe(lv, i))
+                            .on('click', function(e) {
+                                map.setView(e.latlng, Math.min(map.getZoom() + 2, data.pointsZoom));
+                            });
+                    }
+                }
+
+                group.on('add', function() {
+                    map = group._map;
+                    current = null;
+                    draw();
+                    map.on('zoomend', draw);
+                });
+                group.on('remove', function() {
+                    map.off('zoomend', draw);
+                });
+                return group;
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, levels: dict, points: dict, alerts: list, colors: list,
+                 name: str = 'Zonas agrupadas', show: bool = True):
+        super().__init__(name=name, overlay=True, control=True, show=show)
+        self._name = 'AlertClusterLayer'
+        payload = {
+            'minZoom': min(levels),
+            'pointsZoom': max(levels) + 1,
+            'alerts': alerts,
+            'colors': colors,
+            'levels': levels,
+            'points': points
+        }
+        self.payload = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+class AlertTileLayer(JSCSSMixin, Layer):
+    """
+    Capa de municipios servida como teselas vectoriales (MVT)
+
+    El navegador pide solo las teselas visibles al endpoint de teselas
+    (api.py) y colorea cada punto según su atributo 'alerta'; los puntos
+    fundidos en zooms bajos crecen con su 'count'.
+
+    Args:
+        url: Plantilla de URL con {z}/{x}/{y} (puede incluir los filtros)
+        alerts: Niveles de alerta conocidos
+        colors: Color de cada nivel, en el mismo orden
+        name: Nombre de la capa en el LayerControl
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var colors = {{ this.colors|tojson }};
+                var layer = L.vectorGrid.protobuf({{ this.url|tojson }}, {
+                    rendererFactory: L.canvas.tile,
+                    interactive: true,
+                    maxNativeZoom: {{ this.max_native_zoom }},
+                    vectorTileLayerStyles: {
+                        {{ this.layer_name|tojson }}: function(props) {
+                            var color = colors[props.alerta] || '#757575';
+                            return {
+                                radius: props.count > 1 ? 7 + 3 * Math.log2(props.count) : 7,
+                                color: color,
+                                fillColor: color,
+                                fill: true,
+                                fillOpacity: 0.7,
+                                weight: 2
+                            };
+                        }
+                    }
+                });
+                layer.on('click', function(e) {
+                    var p = e.layer.properties;
+                    var html = p.count > 1
+                        ? '<b>' + p.count + ' municipios</b><br>Peor alerta: ' + p.alerta
+                        : '<b>' + p.municipio + '</b><br>' + p.departamento + ' - ' + p.macro
+                            + '<br>Alerta: ' + p.alerta;
+                    L.popup().setLatLng(e.latlng).setContent(html).openOn(layer._map);
+                });
+                return layer;
+            })();
+        {% endmacro %}
+        """
+    )
+
+    default_js = [
+        ('leaflet.vectorgrid', 'https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.min.js')
+    ]
+
+    def __init__(self, url: str, alerts: list, colors: list, max_native_zoom: int = 14,
+                 layer_name: str = 'municipios', name: str = 'Municipios (teselas)', show: bool = True):
+        super().__init__(name=name, overlay=True, control=True, show=show)
+        self._name = 'AlertTileLayer'
+        self.url = url
+        self.colors = dict(zip(alerts, colors))
+        self.max_native_zoom = max_native_zoom
+        self.layer_name = layer_name
+
+
+class AlertChoroplethLayer(Layer):
+    """
+    Coropleta de municipios o departamentos coloreada por nivel de alerta
+
+    Recibe la topología de utils.geometry (arcos compartidos, cuantizados y
+    simplificados por nivel) y la decodifica en el navegador; al cambiar el
+    zoom se redibuja con el nivel de detalle correspondiente.
+
+    Args:
+        topology: Diccionario de simplified_topology
+        values: {código: [etiqueta, alerta]} de choropleth_values
+        level: 'municipio' o 'departamento'
+        colors: {alerta: color}
+        name: Nombre de la capa en el LayerControl
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var data = {{ this.payload }};
+                var renderer = L.canvas({padding: 0.5});
+                var group = L.featureGroup();
+                var decoded = {};
+                var map = null;
+                var current = null;
+                var kx = data.transform.scale[0], ky = data.transform.scale[1];
+                var x0 = data.transform.translate[0], y0 = data.transform.translate[1];
+
+                function levelFor(zoom) {
+                    var index = 0;
+                    for (var i = 0; i < data.levels.length; i++) {
+                        if (zoom >= data.levels[i].min_zoom) { index = i; }
+                    }
+                    return index;
+                }
+
+                function arcsFor(index) {
+                    if (!decoded[index]) {
+                        decoded[index] = data.levels[index].arcs.map(function(flat) {
+                            var x = 0, y = 0, points = [];
+                            for (var i = 0; i < flat.length; i += 2) {
+                                x += flat[i]; y += flat[i + 1];
+                                points.push([y0 + y * ky, x0 + x * kx]);
+                            }
+                            return points;
+                        });
+                    }
+                    return decoded[index];
+                }
+
+                function ringLatLngs(arcs, ids) {
+                    var ring = [];
+                    ids.forEach(function(id, k) {
+                        var points = id >= 0 ? arcs[id] : arcs[~id].slice().reverse();
+                        ring = ring.concat(k > 0 ? points.slice(1) : points);
+                    });
+                    return ring;
+                }
+
+                function draw() {
+                    var index = levelFor(map.getZoom());
+                    if (index === current) { return; }
+                    current = index;
+                    group.clearLayers();
+                    var arcs = arcsFor(index);
+                    data.objects.forEach(function(obj) {
+                        var key = data.level === 'departamento' ? Math.floor(obj.code / 1000) : obj.code;
+                        var value = data.values[key];
+                        var color = value ? data.colors[value[1]] || '#757575' : '#BDBDBD';
+                        var polygon = L.polygon(obj.polygons.map(function(rings) {
+                            return rings.map(function(ids) { return ringLatLngs(arcs, ids); });
+                        }), {
+                            renderer: renderer,
+                            color: data.level === 'departamento' ? color : '#FFFFFF',
+                            weight: data.level === 'departamento' ? 0 : 0.5,
+                            fillColor: color,
+                            fillOpacity: value ? 0.7 : 0.15
+                        });
+                        if (value) {
+                            polygon.bindTooltip('<b>' + value[0] + '</b><br>Alerta: ' + value[1], {sticky: true});
+                        }
+                        group.addLayer(polygon);
+                    });
+                    if (data.level === 'departamento') {
+                        data.dept_mesh.forEach(function(id) {
+                            group.addLayer(L.polyline(arcs[id], {
+                                renderer: renderer, color: '#424242', weight: 1.2, interactive: false
+                            }));
+                        });
+                    }
+                }
+
+                group.on('add', function() {
+                    map = group._map;
+                    current = null;
+                    draw();
+                    map.on('zoomend', draw);
+                });
+                group.on('remove', function() {
+                    map.off('zoomend', draw);
+                });
+                return group;
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, topology: dict, values: dict, level: str, colors: dict,
+                 name: str = None, show: bool = True):
+        super().__init__(name=name or f'Coropleta por {level}', overlay=True, control=True, show=show)
+        self._name = 'AlertChoroplethLayer'
+        payload = {
+            'transform': topology['transform'],
+            'levels': topology['levels'],
+            'objects': topology['objects'],
+            'dept_mesh': topology['dept_mesh'] if level == 'departamento' else [],
+            'values': values,
+            'level': level,
+            'colors': colors
+        }
+        self.payload = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
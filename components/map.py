@@ -1,71 +1,79 @@
-import folium
-from folium import plugins
+import pickle
 import streamlit as st
-from streamlit_folium import folium_static
+import streamlit.components.v1 as components
 import pandas as pd
-from utils.config import ALERT_COLORS, COLOMBIA_CENTER, DEFAULT_ZOOM, MAP_CONFIG
+from utils.cache import ByteBudgetLRU
+from utils.clustering import alert_order, build_cluster_levels, cluster_points, clustering_saves_payload
+from utils.config import ALERT_COLORS, COLOMBIA_CENTER, DEFAULT_ZOOM, MAP_CONFIG, MAP_CACHE_MAX_BYTES, TILE_CONFIG, TILE_URL, BOUNDARY_FILE
+from utils.data_loader import get_data_version
+from utils.density import heat_points
+from utils.geometry import choropleth_values, get_topology
+from utils.profiling import stage, record_metric
+from utils.tiles import LAYER_NAME, filter_query
 
-def create_electoral_map(df: pd.DataFrame) -> folium.Map:
+# folium, sus plugins, las capas propias (.layers) y streamlit_folium se importan
+# al construir cada mapa: el arranque y el HTML ya memoizado no los cargan
+
+def create_electoral_map(df: pd.DataFrame, clustered: bool = False, tile_url: str = None,
+                         focus: dict = None) -> 'folium.Map':
     """
     Crea mapa interactivo de alertas electorales
     
     Args:
         df: DataFrame con datos georeferenciados
+        clustered: Agrupa municipios por zona según el zoom (nivel de detalle)
+        tile_url: URL de teselas vectoriales; si se indica, los municipios se
+            cargan por teselas en lugar de incrustarse en el HTML
+        focus: Municipio en el que se centra el mapa (Municipio, Latitud, Longitud)
         
     Returns:
         Objeto folium.Map
     """
+    import folium
+    from folium import plugins
+    from .layers import AlertPointLayer, AlertClusterLayer, AlertTileLayer
+    
     # Inicializar mapa
     m = folium.Map(
-        location=COLOMBIA_CENTER,
-        zoom_start=DEFAULT_ZOOM,
+        location=[focus['Latitud'], focus['Longitud']] if focus else COLOMBIA_CENTER,
+        zoom_start=MAP_CONFIG['focus_zoom'] if focus else DEFAULT_ZOOM,
         tiles=MAP_CONFIG['tiles'],
         control_scale=True
     )
     
-    # Agregar control de capas
-    feature_groups = {}
-    
-    # Crear grupos por tipo de alerta
-    for alert_type in df['Llamada a la acción'].unique():
-        feature_groups[alert_type] = folium.FeatureGroup(name=alert_type)
+    if focus:
+        folium.Marker(
+            [focus['Latitud'], focus['Longitud']],
+            tooltip=f"{focus['Municipio']} ({focus['Departamento']})"
+        ).add_to(m)
     
-    # Agregar marcadores
-    for _, row in df.iterrows():
-        alert_type = row['Llamada a la acción']
-        
-        # Popup con información detallada
-        popup_html = f"""
-        <div style="font-family: Arial; width: 200px;">
-            <h4 style="margin: 0; color: {ALERT_COLORS[alert_type]};">
-                {row['Municipio']}
-            </h4>
-            <hr style="margin: 5px 0;">
-            <p style="margin: 3px 0;"><b>Departamento:</b> {row['Departamento']}</p>
-            <p style="margin: 3px 0;"><b>Macrorregión:</b> {row['Macrorregion']}</p>
-            <p style="margin: 3px 0;"><b>Alerta:</b> {alert_type}</p>
-            <p style="margin: 3px 0; font-size: 10px; color: gray;">
-                Código: {row['Codigo Divipola']}
-            </p>
-        </div>
-        """
-        
-        # Crear marcador circular
-        folium.CircleMarker(
-            location=[row['Latitud'], row['Longitud']],
-            radius=7,
-            popup=folium.Popup(popup_html, max_width=250),
-            tooltip=f"{row['Municipio']} - {alert_type}",
-            color=ALERT_COLORS[alert_type],
-            fill=True,
-            fillColor=ALERT_COLORS[alert_type],
-            fillOpacity=0.7,
-            weight=2
-        ).add_to(feature_groups[alert_type])
-    
-    # Agregar grupos al mapa
-    for group in feature_groups.values():
-        group.add_to(m)
+    if tile_url:
+        # Solo las teselas visibles, pedidas al endpoint local
+        alerts = alert_order()
+        AlertTileLayer(
+            tile_url,
+            alerts=alerts,
+            colors=[ALERT_COLORS[a] for a in alerts],
+            max_native_zoom=TILE_CONFIG['max_native_zoom'],
+            layer_name=LAYER_NAME
+        ).add_to(m)
+    elif clustered:
+        # Grupos precalculados en los zooms gruesos, coloreados por su peor alerta
+        alerts = alert_order()
+        AlertClusterLayer(
+            build_cluster_levels(df),
+            cluster_points(df),
+            alerts=alerts,
+            colors=[ALERT_COLORS[a] for a in alerts]
+        ).add_to(m)
+    else:
+        # Una capa vectorizada por tipo de alerta (conserva el orden de aparición)
+        for alert_type, group in df.groupby('Llamada a la acción', sort=False, observed=True):
+            AlertPointLayer(
+                group,
+                alert_type=alert_type,
+                color=ALERT_COLORS[alert_type]
+            ).add_to(m)
     
     # Agregar control de capas
     folium.LayerControl(collapsed=False).add_to(m)
@@ -88,9 +96,96 @@ def create_electoral_map(df: pd.DataFrame) -> folium.Map:
     return m
 
 
-def render_map(df: pd.DataFrame):
+@st.cache_resource
+def get_map_html_cache() -> ByteBudgetLRU:
+    """Caché LRU de HTML (y objetos serializados) de mapas, compartida por todas las sesiones"""
+    return ByteBudgetLRU(MAP_CACHE_MAX_BYTES)
+
+
+def map_to_html(m: 'folium.Map') -> str:
+    """Serializa un mapa folium a HTML (equivalente a folium_static)"""
+    import folium
+    return folium.Figure().add_child(m).render()
+
+
+def show_map_html(html: str):
+    """Muestra HTML de mapa ya serializado en Streamlit"""
+    components.html(html, width=MAP_CONFIG['width'], height=MAP_CONFIG['height'] + 10)
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_clustering_choice(_df: pd.DataFrame, data_version: str, cache_key: tuple) -> bool:
+    return clustering_saves_payload(_df)
+
+
+def prefer_clusters(df: pd.DataFrame, cache_key: tuple = None) -> bool:
+    """Agrupar por defecto solo si la capa agrupada pesa menos que los puntos"""
+    data_version = get_data_version(df)
+    if cache_key is None or not data_version:
+        return clustering_saves_payload(df)
+    return _cached_clustering_choice(df, data_version, cache_key)
+
+
+def get_map_html(kind: str, builder, df: pd.DataFrame, cache_key: tuple = None, variant=None) -> str:
+    """
+    HTML de un mapa, memoizado por (tipo, versión de datos, filtros)
+
+    Args:
+        kind: Identificador del mapa ('electoral', 'heat', ...)
+        builder: Función df -> folium.Map
+        df: DataFrame filtrado
+        cache_key: Clave de filtros (make_filter_key); None desactiva la caché
+        variant: Parámetro adicional del mapa que distingue el HTML (p. ej. el foco)
+    """
+    def build():
+        with stage(f'mapa_{kind}'):
+            return map_to_html(builder(df))
+
+    if cache_key is None:
+        html = build()
+    else:
+        key = (kind, get_data_version(df), cache_key, variant)
+        cache = get_map_html_cache()
+        record_metric(f'mapa_{kind}_cache', 'hit' if key in cache else 'miss')
+        html = cache.get_or_create(key, build)
+
+    record_metric(f'mapa_{kind}_bytes', len(html))
+    return html
+
+
+def get_map_object(kind: str, builder, df: pd.DataFrame, cache_key: tuple = None, variant=None) -> 'folium.Map':
+    """
+    Mapa folium listo para st_folium, memoizado por (tipo, versión de datos, filtros)
+
+    Se guarda serializado (pickle) en la misma caché que el HTML y cada
+    llamada devuelve una copia nueva: st_folium modifica el objeto al
+    renderizarlo, y las copias conservan los nombres de sus elementos, de
+    modo que el script del mapa es idéntico entre reruns y no se recarga.
+
+    Args:
+        Los mismos que get_map_html
+    """
+    if cache_key is None:
+        return builder(df)
+
+    def build():
+        with stage(f'mapa_{kind}'):
+            return pickle.dumps(builder(df), protocol=pickle.HIGHEST_PROTOCOL)
+
+    key = ('objeto', kind, get_data_version(df), cache_key, variant)
+    cache = get_map_html_cache()
+    record_metric(f'mapa_{kind}_objeto_cache', 'hit' if key in cache else 'miss')
+    return pickle.loads(cache.get_or_create(key, build))
+
+
+def render_map(df: pd.DataFrame, cache_key: tuple = None, focus: dict = None):
     """
     Renderiza el mapa en Streamlit
+
+    Args:
+        df: DataFrame filtrado
+        cache_key: Clave de filtros para reutilizar el HTML ya generado
+        focus: Municipio elegido en la búsqueda, para centrar la vista general
     """
     if df.empty:
         st.warning("⚠️ No hay datos para visualizar")
@@ -99,11 +194,44 @@ def render_map(df: pd.DataFrame):
     st.markdown("### Mapa de Alertas Electorales")
     
     # Crear tabs para diferentes vistas
-    tab1, tab2 = st.tabs(["Vista General", "Mapa de Calor"])
+    tab1, tab2, tab3 = st.tabs(["Vista General", "Mapa de Calor", "Coropletas"])
     
     with tab1:
-        m = create_electoral_map(df)
-        folium_static(m, width=MAP_CONFIG['width'], height=MAP_CONFIG['height'])
+        synced = st.toggle(
+            "Sincronizar indicadores con la vista del mapa",
+            key='mapa_sincronizado',
+            help="Las tarjetas, el resumen regional y el top de departamentos se limitan a los municipios visibles"
+        )
+        
+        if TILE_URL and cache_key is not None:
+            # Teselas del endpoint local con los mismos filtros de la sesión
+            tile_url = TILE_URL + filter_query(cache_key)
+            kind = 'electoral_tiles'
+            builder = lambda d: create_electoral_map(d, tile_url=tile_url, focus=focus)
+        else:
+            clustered = st.toggle(
+                "Agrupar municipios por zona",
+                value=prefer_clusters(df, cache_key),
+                help="Muestra grupos coloreados por su alerta más grave que se desagregan al acercar el mapa"
+            )
+            kind = 'electoral_cluster' if clustered else 'electoral'
+            builder = lambda d: create_electoral_map(d, clustered=clustered, focus=focus)
+        
+        variant = focus['Codigo Divipola'] if focus else None
+        if synced:
+            # Mapa bidireccional: devuelve la vista y el último clic (ver components/viewport.py)
+            from streamlit_folium import st_folium
+            m = get_map_object(kind, builder, df, cache_key, variant=variant)
+            with stage(f'mapa_{kind}_sincronizado'):
+                st_folium(
+                    m,
+                    key='mapa_vista',
+                    returned_objects=['bounds', 'last_clicked'],
+                    width=MAP_CONFIG['width'],
+                    height=MAP_CONFIG['height']
+                )
+        else:
+            show_map_html(get_map_html(kind, builder, df, cache_key, variant=variant))
         
         # Leyenda personalizada
         st.markdown("""
@@ -127,34 +255,52 @@ def render_map(df: pd.DataFrame):
     
     with tab2:
         # Mapa de calor
-        heat_map = create_heat_map(df)
-        folium_static(heat_map, width=MAP_CONFIG['width'], height=MAP_CONFIG['height'])
+        show_map_html(get_map_html('heat', create_heat_map, df, cache_key))
+    
+    with tab3:
+        topology = get_topology()
+        if topology is None:
+            st.info(f"ℹ️ Agregue el archivo de límites municipales ({BOUNDARY_FILE}) para ver las coropletas")
+        else:
+            level = st.radio(
+                "Colorear por",
+                ['municipio', 'departamento'],
+                format_func=str.capitalize,
+                horizontal=True,
+                help="Por departamento se usa la alerta más grave de sus municipios"
+            )
+            show_map_html(get_map_html(
+                f'choropleth_{level}', lambda d: create_choropleth_map(d, topology, level), df, cache_key
+            ))
 
 
-def create_heat_map(df: pd.DataFrame) -> folium.Map:
+def create_heat_map(df: pd.DataFrame) -> 'folium.Map':
     """
     Crea mapa de calor basado en concentración de alertas críticas
+    
+    La densidad se calcula en el servidor (utils.density) con el ancho de
+    banda y los pesos por nivel de HEATMAP_CONFIG.
     """
+    import folium
+    from folium import plugins
+    
     m = folium.Map(
         location=COLOMBIA_CENTER,
         zoom_start=DEFAULT_ZOOM,
         tiles=MAP_CONFIG['tiles']
     )
     
-    # Filtrar solo alertas críticas
-    critical = df[df['Llamada a la acción'].isin(['Inmediata', 'Urgente'])]
+    # Densidad precalculada en rejilla (ponderada por nivel de alerta)
+    heat_data = heat_points(df)
     
-    if len(critical) > 0:
-        # Preparar datos para heatmap
-        heat_data = [[row['Latitud'], row['Longitud']] for _, row in critical.iterrows()]
-        
-        # Agregar heatmap
+    if heat_data:
         plugins.HeatMap(
             heat_data,
             min_opacity=0.3,
             max_zoom=18,
             radius=15,
             blur=20,
+            max=1.0,
             gradient={
                 '0.0': 'blue',
                 '0.5': 'yellow',
@@ -163,4 +309,29 @@ def create_heat_map(df: pd.DataFrame) -> folium.Map:
             }
         ).add_to(m)
     
-    return m
\ No newline at end of file
+    return m
+
+def create_choropleth_map(df: pd.DataFrame, topology: dict, level: str = 'municipio') -> 'folium.Map':
+    """
+    Crea mapa de coropletas por municipio o departamento
+    
+    Las geometrías salen de la caché simplificada de utils.geometry y se
+    unen con los datos por código Divipola.
+    """
+    import folium
+    from .layers import AlertChoroplethLayer
+    
+    m = folium.Map(
+        location=COLOMBIA_CENTER,
+        zoom_start=DEFAULT_ZOOM,
+        tiles=MAP_CONFIG['tiles']
+    )
+    
+    AlertChoroplethLayer(
+        topology,
+        values=choropleth_values(df, level),
+        level=level,
+        colors=ALERT_COLORS
+    ).add_to(m)
+    
+    return m
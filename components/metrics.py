@@ -1,44 +1,20 @@
 import streamlit as st
 import pandas as pd
-from utils.config import ALERT_COLORS, ALERT_PRIORITY
+from utils.aggregates import AlertCube
+from utils.config import ALERT_COLORS, ALERT_PRIORITY, CRITICAL_ALERTS
 
-def render_kpi_cards(df: pd.DataFrame):
-    """
-    Tarjetas KPI con diseño ejecutivo minimalista
-    """
-    st.markdown("""
-    <div style="
-        font-size: 14px;
-        font-weight: 600;
-        color: #1A1A1A;
-        margin-bottom: 20px;
-        letter-spacing: 0.5px;
-    ">DISTRIBUCIÓN DE ALERTAS POR NIVEL</div>
-    """, unsafe_allow_html=True)
-    
-    # Obtener conteos por tipo de alerta
-    alert_counts = df['Llamada a la acción'].value_counts()
-    
-    # Ordenar por prioridad
-    alert_order = sorted(ALERT_PRIORITY.keys(), key=lambda x: ALERT_PRIORITY[x])
-    
-    # Crear 5 columnas
-    cols = st.columns(5)
-    
-    alert_labels = {
-        'Inmediata': 'INMEDIATA',
-        'Urgente': 'URGENTE',
-        'Prioritaria': 'PRIORITARIA',
-        'Observación permanente': 'MONITOREO',
-        'Ordinaria': 'ORDINARIA'
-    }
-    
-    for idx, alert_type in enumerate(alert_order):
-        count = alert_counts.get(alert_type, 0)
-        percentage = (count / len(df) * 100) if len(df) > 0 else 0
-        
-        with cols[idx]:
-            st.markdown(f"""
+ALERT_LABELS = {
+    'Inmediata': 'INMEDIATA',
+    'Urgente': 'URGENTE',
+    'Prioritaria': 'PRIORITARIA',
+    'Observación permanente': 'MONITOREO',
+    'Ordinaria': 'ORDINARIA'
+}
+
+
+def kpi_card_html(alert_type: str, count: int, percentage: float) -> str:
+    """HTML de la tarjeta KPI de un nivel de alerta"""
+    return f"""
             <div style="
                 background: #FFFFFF;
                 border: 1px solid #E0E0E0;
@@ -59,18 +35,69 @@ def render_kpi_cards(df: pd.DataFrame):
                     color: #666666;
                     font-weight: 600;
                     margin-bottom: 4px;
-                ">{alert_labels[alert_type]}</div>
+                ">{ALERT_LABELS[alert_type]}</div>
                 <div style="
                     font-size: 11px;
                     color: #999999;
                 ">{percentage:.1f}%</div>
             </div>
-            """, unsafe_allow_html=True)
+            """
+
+
+def regional_table(cube: AlertCube) -> pd.DataFrame:
+    """Conteos por macrorregión y nivel, con Críticas y Total, de más a menos críticas"""
+    # Niveles excluidos por el filtro quedan en cero
+    regional = cube.macro_by_alert()
+    total = regional.sum(axis=1)
+    regional = regional.reindex(columns=list(ALERT_PRIORITY), fill_value=0)
+    
+    # Calcular alertas críticas (Inmediata + Urgente)
+    regional['Críticas'] = regional[CRITICAL_ALERTS].sum(axis=1)
+    regional['Total'] = total
+    return regional.sort_values('Críticas', ascending=False)
 
 
-def render_regional_summary(df: pd.DataFrame):
+def render_kpi_cards(cube: AlertCube):
+    """
+    Tarjetas KPI con diseño ejecutivo minimalista
+    
+    Args:
+        cube: Cubo de conteos ya recortado a los filtros activos
+    """
+    st.markdown("""
+    <div style="
+        font-size: 14px;
+        font-weight: 600;
+        color: #1A1A1A;
+        margin-bottom: 20px;
+        letter-spacing: 0.5px;
+    ">DISTRIBUCIÓN DE ALERTAS POR NIVEL</div>
+    """, unsafe_allow_html=True)
+    
+    # Obtener conteos por tipo de alerta
+    alert_counts = cube.alert_counts()
+    total = cube.total
+    
+    # Ordenar por prioridad
+    alert_order = sorted(ALERT_PRIORITY.keys(), key=lambda x: ALERT_PRIORITY[x])
+    
+    # Crear 5 columnas
+    cols = st.columns(5)
+    
+    for idx, alert_type in enumerate(alert_order):
+        count = alert_counts.get(alert_type, 0)
+        percentage = (count / total * 100) if total > 0 else 0
+        
+        with cols[idx]:
+            st.markdown(kpi_card_html(alert_type, count, percentage), unsafe_allow_html=True)
+
+
+def render_regional_summary(cube: AlertCube):
     """
     Análisis ejecutivo por macrorregión
+    
+    Args:
+        cube: Cubo de conteos ya recortado a los filtros activos
     """
     st.markdown("""
     <div style="
@@ -83,16 +110,7 @@ def render_regional_summary(df: pd.DataFrame):
     """, unsafe_allow_html=True)
     
     # Agrupar por macrorregión
-    regional = df.groupby(['Macrorregion', 'Llamada a la acción']).size().unstack(fill_value=0)
-    
-    # Calcular alertas críticas (Inmediata + Urgente)
-    if 'Inmediata' in regional.columns and 'Urgente' in regional.columns:
-        regional['Críticas'] = regional['Inmediata'] + regional['Urgente']
-    else:
-        regional['Críticas'] = 0
-    
-    regional['Total'] = regional.sum(axis=1)
-    regional = regional.sort_values('Críticas', ascending=False)
+    regional = regional_table(cube)
     
     # Mostrar tabla
     col1, col2 = st.columns([3, 2])
@@ -151,9 +169,13 @@ def render_regional_summary(df: pd.DataFrame):
             """, unsafe_allow_html=True)
 
 
-def render_top_departments(df: pd.DataFrame, n: int = 10):
+def render_top_departments(cube: AlertCube, n: int = 10):
     """
     Ranking de departamentos con alertas críticas
+    
+    Args:
+        cube: Cubo de conteos ya recortado a los filtros activos
+        n: Número de departamentos a mostrar
     """
     st.markdown(f"""
     <div style="
@@ -165,11 +187,10 @@ def render_top_departments(df: pd.DataFrame, n: int = 10):
     ">TOP {n} DEPARTAMENTOS CON ALERTAS CRÍTICAS</div>
     """, unsafe_allow_html=True)
     
-    # Filtrar solo alertas críticas
-    critical = df[df['Llamada a la acción'].isin(['Inmediata', 'Urgente'])]
+    # Conteo de alertas críticas por departamento
+    dept_counts = cube.dept_counts_for(CRITICAL_ALERTS).head(n)
     
-    if len(critical) > 0:
-        dept_counts = critical['Departamento'].value_counts().head(n)
+    if len(dept_counts) > 0:
         
         # Crear gráfico de barras
         chart_data = pd.DataFrame({
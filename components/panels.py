@@ -0,0 +1,34 @@
+import functools
+import streamlit as st
+from utils.profiling import current_profiler, start_rerun
+
+def panel(name: str):
+    """
+    Convierte una función de renderizado en un panel independiente (st.fragment)
+    
+    Los widgets del panel solo vuelven a ejecutar el panel, con las mismas
+    entradas recibidas en el último rerun completo; por eso cada panel debe
+    recibir como argumentos todo aquello de lo que depende. Dentro de un
+    rerun completo se mide como una etapa más; un rerun del panel se mide
+    y registra por separado.
+    
+    Args:
+        name: Nombre de la etapa en el perfilador
+    """
+    def decorate(render):
+        @st.fragment
+        @functools.wraps(render)
+        def run(*args, **kwargs):
+            profiler = current_profiler()
+            if profiler is not None and not profiler.finished:
+                with profiler.stage(name):
+                    return render(*args, **kwargs)
+            
+            profiler = start_rerun()
+            profiler.metric('panel', name)
+            with profiler.stage(name):
+                result = render(*args, **kwargs)
+            profiler.log()
+            return result
+        return run
+    return decorate
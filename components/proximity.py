@@ -0,0 +1,89 @@
+import streamlit as st
+import pandas as pd
+from utils.config import CRITICAL_ALERTS, SPATIAL_CONFIG
+from utils.data_loader import get_data_version
+from utils.spatial import get_spatial_index
+
+@st.cache_data(show_spinner=False)
+def _critical_neighbors(_df: pd.DataFrame, data_version: str, radius_km: int) -> pd.Series:
+    """Alertas críticas a menos de radius_km de cada municipio"""
+    mask = _df['Llamada a la acción'].isin(CRITICAL_ALERTS).to_numpy()
+    counts = get_spatial_index(_df).neighbor_counts(radius_km, mask)
+    return pd.Series(counts, index=_df.index)
+
+
+@st.cache_resource(show_spinner=False)
+def _municipio_options(_df: pd.DataFrame, data_version: str) -> tuple:
+    """
+    Etiquetas 'Municipio (Departamento)' ordenadas y su posición de fila
+
+    Se construyen una vez por versión de datos (y no en cada rerun); el
+    resultado es de solo lectura, por eso se comparte sin copiarlo.
+    """
+    labels = _df['Municipio'].astype(str) + ' (' + _df['Departamento'].astype(str) + ')'
+    positions_by_label = dict(zip(labels, range(len(_df))))
+    return sorted(positions_by_label), positions_by_label
+
+
+def render_proximity_search(df: pd.DataFrame, top: int = 10):
+    """
+    Búsqueda por radio alrededor de un municipio y vecindad de alertas críticas
+
+    Args:
+        df: Dataset completo (las distancias no dependen de los filtros)
+        top: Municipios a listar por número de vecinos críticos
+    """
+    with st.expander("📍 Búsqueda por proximidad", expanded=False):
+        col1, col2 = st.columns([2, 1])
+
+        options, positions_by_label = _municipio_options(df, get_data_version(df))
+        with col1:
+            choice = st.selectbox(
+                "Municipio de referencia",
+                options=options,
+                index=None,
+                placeholder="Seleccione un municipio"
+            )
+        with col2:
+            radius_km = st.slider(
+                "Radio (km)",
+                min_value=5,
+                max_value=200,
+                value=SPATIAL_CONFIG['default_radius_km'],
+                step=5
+            )
+        only_critical = st.checkbox(f"Solo alertas críticas ({', '.join(CRITICAL_ALERTS)})", value=True)
+
+        index = get_spatial_index(df)
+
+        if choice is not None:
+            row = positions_by_label[choice]
+            positions, distances = index.radius(
+                float(df['Latitud'].iloc[row]), float(df['Longitud'].iloc[row]), radius_km
+            )
+            nearby = df.iloc[positions][['Municipio', 'Departamento', 'Llamada a la acción']].assign(
+                **{'Distancia (km)': distances.round(1)}
+            )
+            nearby = nearby[positions != row]
+            critical = nearby['Llamada a la acción'].isin(CRITICAL_ALERTS)
+
+            m1, m2 = st.columns(2)
+            m1.metric(f"Municipios a menos de {radius_km} km", f"{len(nearby):,}")
+            m2.metric("🚨 Con alerta crítica", f"{int(critical.sum()):,}")
+
+            if only_critical:
+                nearby = nearby[critical]
+            st.dataframe(nearby, use_container_width=True, hide_index=True, height=250)
+
+        # Vecindad: municipios rodeados de más alertas críticas
+        counts = _critical_neighbors(df, get_data_version(df), radius_km)
+        leaders = counts[counts > 0].sort_values(ascending=False).head(top)
+        if not leaders.empty:
+            st.caption(f"Municipios con más alertas críticas a menos de {radius_km} km")
+            st.dataframe(
+                df.loc[leaders.index, ['Municipio', 'Departamento', 'Llamada a la acción']].assign(
+                    **{'Alertas críticas cercanas': leaders.to_numpy()}
+                ),
+                use_container_width=True,
+                hide_index=True
+            )
@@ -0,0 +1,78 @@
+import math
+import streamlit as st
+import pandas as pd
+from utils.config import TABLE_CONFIG
+from utils.data_loader import filter_positions, get_data_version
+from utils.sorting import get_sort_index
+
+def render_data_table(df: pd.DataFrame, cache_key: tuple = ((), (), ())):
+    """
+    Tabla detallada por páginas, ordenada en el servidor
+
+    Solo se envía al navegador la página visible; mientras la tabla está
+    oculta no se calcula nada.
+
+    Args:
+        df: Dataset completo
+        cache_key: Clave de filtros (make_filter_key)
+    """
+    if not st.toggle("📋 Ver Tabla Completa de Datos", value=False, key='tabla_visible'):
+        return
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+
+    with col1:
+        column = st.selectbox(
+            "Ordenar por",
+            options=TABLE_CONFIG['columns'],
+            index=TABLE_CONFIG['columns'].index(TABLE_CONFIG['default_sort']),
+            key='tabla_orden'
+        )
+    with col2:
+        descending = st.toggle(
+            "Descendente",
+            value=False,
+            key='tabla_descendente',
+            help="En 'Llamada a la acción' el orden ascendente va de la alerta más grave a la menos grave"
+        )
+    with col3:
+        page_size = st.selectbox(
+            "Filas por página",
+            options=TABLE_CONFIG['page_sizes'],
+            index=TABLE_CONFIG['page_sizes'].index(TABLE_CONFIG['page_size']),
+            key='tabla_tamano'
+        )
+
+    positions = filter_positions(df, *cache_key)
+    total = len(df) if positions is None else len(positions)
+    n_pages = max(math.ceil(total / page_size), 1)
+
+    # Un cambio de datos, filtros u orden vuelve a la primera página
+    view = (get_data_version(df), cache_key, column, descending, page_size)
+    if st.session_state.get('tabla_vista') != view:
+        st.session_state['tabla_vista'] = view
+        st.session_state['tabla_pagina'] = 1
+    elif st.session_state.get('tabla_pagina', 1) > n_pages:
+        st.session_state['tabla_pagina'] = n_pages
+
+    page = st.number_input(
+        f"Página (de {n_pages:,})",
+        min_value=1,
+        max_value=n_pages,
+        step=1,
+        key='tabla_pagina'
+    )
+
+    rows, total = get_sort_index(df).page(column, descending, positions, page, page_size)
+
+    if total == 0:
+        st.info("No hay municipios con los filtros actuales")
+        return
+
+    first = (page - 1) * page_size + 1
+    st.caption(f"Filas {first:,}–{first + len(rows) - 1:,} de {total:,}")
+    st.dataframe(
+        df.iloc[rows][TABLE_CONFIG['columns']],
+        use_container_width=True,
+        hide_index=True
+    )
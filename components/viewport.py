@@ -0,0 +1,105 @@
+import streamlit as st
+import pandas as pd
+from utils.aggregates import AlertCube
+from utils.config import SPATIAL_CONFIG
+from utils.data_loader import filter_positions
+from utils.profiling import stage
+from utils.spatial import get_spatial_index
+from .map import render_map
+from .metrics import render_kpi_cards, render_regional_summary, render_top_departments
+
+# Claves de sesión del mapa sincronizado (ver render_map)
+SYNC_KEY = 'mapa_sincronizado'
+VIEWPORT_KEY = 'mapa_vista'
+
+def map_viewport() -> tuple:
+    """
+    Rectángulo visible del mapa sincronizado
+
+    Returns:
+        Tupla (sur, oeste, norte, este), o None si el mapa no está sincronizado
+        o aún no informó su vista
+    """
+    if not st.session_state.get(SYNC_KEY):
+        return None
+    bounds = (st.session_state.get(VIEWPORT_KEY) or {}).get('bounds') or {}
+    try:
+        south_west, north_east = bounds['_southWest'], bounds['_northEast']
+        return (float(south_west['lat']), float(south_west['lng']),
+                float(north_east['lat']), float(north_east['lng']))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def clicked_municipio(df: pd.DataFrame, filter_key: tuple) -> pd.Series:
+    """Municipio filtrado más cercano al último clic en el mapa sincronizado, o None"""
+    if not st.session_state.get(SYNC_KEY):
+        return None
+    click = (st.session_state.get(VIEWPORT_KEY) or {}).get('last_clicked')
+    if not click:
+        return None
+
+    positions, _ = get_spatial_index(df).radius(
+        float(click['lat']), float(click['lng']), SPATIAL_CONFIG['click_tolerance_km']
+    )
+    selected = filter_positions(df, *filter_key)
+    if selected is not None:
+        positions = positions[pd.Index(selected).get_indexer(positions) >= 0]
+    return df.iloc[positions[0]] if len(positions) else None
+
+
+def render_overview(df: pd.DataFrame, df_filtered: pd.DataFrame, cube: AlertCube,
+                    filter_key: tuple, focus: dict = None):
+    """
+    Tarjetas KPI, mapa principal, resumen regional y top de departamentos
+
+    Con el mapa sincronizado, los indicadores se limitan a los municipios
+    visibles: la vista se resuelve con el índice espacial y se cuenta sobre
+    el cubo, sin volver a filtrar las filas.
+
+    Args:
+        df: Dataset completo
+        df_filtered: Filas filtradas (las que dibuja el mapa)
+        cube: Cubo de conteos del dataset completo
+        filter_key: Clave de filtros (make_filter_key)
+        focus: Municipio elegido en la búsqueda
+    """
+    viewport = map_viewport()
+
+    with stage('cubo_vista'):
+        if viewport is None:
+            view_cube = cube.select(*filter_key)
+        else:
+            view_cube = cube.subset(df, get_spatial_index(df).bbox(*viewport)).select(*filter_key)
+
+    # KPI Cards
+    with stage('kpis'):
+        if viewport is not None:
+            st.caption(f"🗺️ Indicadores limitados a la vista del mapa: {view_cube.total:,} municipios visibles")
+        render_kpi_cards(view_cube)
+
+    st.markdown("---")
+
+    # Mapa principal
+    with stage('mapa'):
+        render_map(df_filtered, cache_key=filter_key, focus=focus)
+
+        municipio = clicked_municipio(df, filter_key)
+        if municipio is not None:
+            st.info(
+                f"📍 **{municipio['Municipio']}** ({municipio['Departamento']}) · "
+                f"{municipio['Macrorregion']} · Alerta {municipio['Llamada a la acción']}"
+            )
+
+    st.markdown("---")
+
+    # Análisis regional y departamental
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        with stage('resumen_regional'):
+            render_regional_summary(view_cube)
+
+    with col2:
+        with stage('top_departamentos'):
+            render_top_departments(view_cube, n=10)
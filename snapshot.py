@@ -0,0 +1,219 @@
+"""
+Instantáneas estáticas del dashboard para la vista general y vistas guardadas
+
+Genera un HTML autocontenido por vista (encabezado, tarjetas KPI, mapas,
+resumen regional y top de departamentos) en SNAPSHOT_DIR. Solo se
+regenera cuando cambia la versión de los datos o las vistas configuradas.
+
+Con enableStaticServing (ver .streamlit/config.toml) Streamlit las sirve en
+/app/static/snapshot/index.html sin ejecutar el script. Uso:
+    python snapshot.py               # genera si los datos cambiaron
+    python snapshot.py --watch 60    # sigue comprobando cada 60 s
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import time
+from datetime import datetime as dt
+
+import pandas as pd
+
+from components.map import create_electoral_map, create_heat_map, map_to_html
+from components.metrics import ALERT_LABELS, kpi_card_html, regional_table
+from utils.aggregates import AlertCube, get_alert_cube
+from utils.clustering import clustering_saves_payload
+from utils.config import (
+    ALERT_PRIORITY, CRITICAL_ALERTS, CURRENT_BULLETIN, DATA_FILE,
+    DATA_SOURCE, SNAPSHOT_DIR, SNAPSHOT_PRESETS
+)
+from utils.data_loader import filter_data, get_data_version, read_electoral_data
+
+pd.set_option('mode.copy_on_write', True)
+
+MANIFEST_FILE = 'manifest.json'
+
+_PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+    body {{ font-family: "Source Sans Pro", Arial, sans-serif; color: #1A1A1A; margin: 0 auto; max-width: 1400px; padding: 24px; }}
+    .section {{ font-size: 14px; font-weight: 600; letter-spacing: 0.5px; margin: 32px 0 16px; }}
+    .grid {{ display: grid; gap: 16px; }}
+    .kpis {{ grid-template-columns: repeat(5, 1fr); }}
+    .two {{ grid-template-columns: 1fr 1fr; }}
+    nav a {{ margin-right: 12px; font-size: 12px; color: #C62828; }}
+    table {{ border-collapse: collapse; width: 100%; font-size: 12px; }}
+    th, td {{ border-bottom: 1px solid #E0E0E0; padding: 6px 8px; text-align: right; }}
+    th:first-child, td:first-child {{ text-align: left; }}
+    .bar {{ background: #C62828; height: 14px; }}
+    iframe {{ border: 1px solid #E0E0E0; width: 100%; height: 600px; }}
+    footer {{ text-align: center; color: #666666; font-size: 12px; padding: 20px 0; }}
+</style>
+</head>
+<body>
+<div style="border-bottom: 3px solid #C62828; padding-bottom: 16px;">
+    <div style="font-size: 11px; letter-spacing: 2px; color: #666666; font-weight: 600;">{source}</div>
+    <h1 style="margin: 4px 0; font-size: 32px; font-weight: 600;">Alerta Temprana Electoral {bulletin}</h1>
+    <div style="font-size: 14px; color: #666666;">{subtitle}</div>
+    <div style="font-size: 11px; color: #999999; margin-top: 8px;">Datos versión {version} · Generado: {generated}</div>
+</div>
+<nav style="margin-top: 12px;">{nav}</nav>
+<div class="section">DISTRIBUCIÓN DE ALERTAS POR NIVEL</div>
+<div class="grid kpis">{kpis}</div>
+<div class="section">MAPA DE ALERTAS ELECTORALES</div>
+<iframe srcdoc="{map}" loading="lazy"></iframe>
+<div class="section">MAPA DE CALOR (ALERTAS CRÍTICAS)</div>
+<iframe srcdoc="{heat_map}" loading="lazy"></iframe>
+<div class="grid two">
+    <div><div class="section">ANÁLISIS POR MACRORREGIÓN</div>{regional}</div>
+    <div><div class="section">TOP {top_n} DEPARTAMENTOS CON ALERTAS CRÍTICAS</div>{top}</div>
+</div>
+<footer>Dashboard desarrollado para el Ministerio del Interior · Grupo de Asuntos Electorales</footer>
+</body>
+</html>
+"""
+
+
+def _views(presets: dict) -> dict:
+    """Vista general ('index') más las vistas guardadas, como claves de filtros"""
+    views = {'index': ('Vista general', ((), (), ()))}
+    for slug, preset in presets.items():
+        views[slug] = (preset['titulo'], tuple(
+            tuple(sorted(preset.get(name) or ())) for name in ('macroregiones', 'alertas', 'departamentos')
+        ))
+    return views
+
+
+def _regional_html(cube: AlertCube) -> str:
+    regional = regional_table(cube)[['Inmediata', 'Urgente', 'Prioritaria', 'Críticas', 'Total']]
+    regional.columns = ['Inmediatas', 'Urgentes', 'Prioritarias', 'Críticas', 'Total']
+    return regional.to_html(border=0)
+
+
+def _top_html(cube: AlertCube, n: int) -> str:
+    counts = cube.dept_counts_for(CRITICAL_ALERTS).head(n)
+    if counts.empty:
+        return '<p>No se registran alertas críticas en los datos filtrados</p>'
+    rows = ''.join(
+        f'<tr><td>{html.escape(str(dept))}</td><td>{count:,}</td>'
+        f'<td style="width: 60%;"><div class="bar" style="width: {count / counts.max():.0%};"></div></td></tr>'
+        for dept, count in counts.items()
+    )
+    return f'<table>{rows}</table>'
+
+
+def render_view(df: pd.DataFrame, title: str, filter_key: tuple, nav: str, top_n: int = 10) -> str:
+    """HTML autocontenido de una vista (df es el dataset completo)"""
+    view_df = filter_data(df, *filter_key)
+    cube = get_alert_cube(df).select(*filter_key)
+
+    alert_counts = cube.alert_counts()
+    total = cube.total
+    kpis = ''.join(
+        kpi_card_html(alert, int(alert_counts.get(alert, 0)),
+                      (alert_counts.get(alert, 0) / total * 100) if total > 0 else 0)
+        for alert in sorted(ALERT_LABELS, key=ALERT_PRIORITY.get)
+    )
+
+    clustered = clustering_saves_payload(view_df)
+    return _PAGE.format(
+        title=html.escape(f'Alerta Electoral {CURRENT_BULLETIN} - {title}'),
+        source=html.escape(DATA_SOURCE),
+        bulletin=html.escape(CURRENT_BULLETIN),
+        subtitle=html.escape(title),
+        version=get_data_version(df),
+        generated=dt.now().strftime('%Y-%m-%d %H:%M'),
+        nav=nav,
+        kpis=kpis,
+        map=html.escape(map_to_html(create_electoral_map(view_df, clustered=clustered)), quote=True),
+        heat_map=html.escape(map_to_html(create_heat_map(view_df)), quote=True),
+        regional=_regional_html(cube),
+        top_n=top_n,
+        top=_top_html(cube, top_n)
+    )
+
+
+def _presets_digest(presets: dict) -> str:
+    return hashlib.sha1(json.dumps(presets, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+
+
+def is_current(df: pd.DataFrame, out_dir: str = SNAPSHOT_DIR, presets: dict = SNAPSHOT_PRESETS) -> bool:
+    """True si las instantáneas existentes corresponden a estos datos y vistas"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return False
+    return (manifest.get('data_version') == get_data_version(df)
+            and manifest.get('presets') == _presets_digest(presets))
+
+
+def build_snapshot(df: pd.DataFrame, out_dir: str = SNAPSHOT_DIR,
+                   presets: dict = SNAPSHOT_PRESETS, force: bool = False) -> bool:
+    """
+    Genera las instantáneas si los datos o las vistas cambiaron
+
+    Se escriben en un directorio temporal que luego reemplaza a out_dir,
+    de modo que nunca se sirve un conjunto a medias.
+
+    Returns:
+        True si se regeneraron
+    """
+    if not force and is_current(df, out_dir, presets):
+        return False
+
+    views = _views(presets)
+    nav = ' '.join(f'<a href="{slug}.html">{html.escape(title)}</a>' for slug, (title, _) in views.items())
+
+    tmp_dir = f'{out_dir.rstrip(os.sep)}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for slug, (title, filter_key) in views.items():
+        with open(os.path.join(tmp_dir, f'{slug}.html'), 'w', encoding='utf-8') as fh:
+            fh.write(render_view(df, title, filter_key, nav))
+
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as fh:
+        json.dump({
+            'data_version': get_data_version(df),
+            'presets': _presets_digest(presets),
+            'generated': dt.now().isoformat(timespec='seconds'),
+            'views': {slug: title for slug, (title, _) in views.items()}
+        }, fh, ensure_ascii=False, indent=2)
+
+    old_dir = f'{out_dir.rstrip(os.sep)}.old-{os.getpid()}'
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Instantáneas estáticas del dashboard")
+    parser.add_argument('--data', default=DATA_FILE, help='Libro de Excel de origen')
+    parser.add_argument('--out', default=SNAPSHOT_DIR, help='Directorio de salida')
+    parser.add_argument('--force', action='store_true', help='Regenerar aunque los datos no cambien')
+    parser.add_argument('--watch', type=float, metavar='SEGUNDOS',
+                        help='Seguir comprobando los datos y regenerar al cambiar')
+    args = parser.parse_args(argv)
+
+    while True:
+        df, _ = read_electoral_data(args.data)
+        built = build_snapshot(df, args.out, force=args.force)
+        state = 'generadas' if built else 'vigentes'
+        print(f"Instantáneas {state} para la versión {get_data_version(df)} en {args.out}", flush=True)
+        if not args.watch:
+            return 0
+        args.force = False
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
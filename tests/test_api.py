@@ -0,0 +1,46 @@
+"""Filtros de la API con valores que contienen comas"""
+
+import pandas as pd
+import pytest
+
+from api import parse_filters, summary_payload
+from benchmarks.synthetic import generate_alerts
+from utils.data_loader import compact_frame, make_filter_key
+from utils.tiles import filter_query
+
+BOGOTA = 'Bogotá, D.C.'
+SAN_ANDRES = 'Archipiélago de San andrés, Providencia y Santa Catalina'
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    data = generate_alerts(200)
+    data['Departamento'] = data['Departamento'].replace({
+        'Departamento 01': BOGOTA,
+        'Departamento 02': SAN_ANDRES
+    })
+    return compact_frame(data)
+
+
+def test_parse_filters_keeps_commas_inside_values():
+    key = parse_filters('departamento=Bogot%C3%A1%2C+D.C.&alerta=Urgente'.encode('latin-1'))
+    assert key == make_filter_key(None, ['Urgente'], [BOGOTA])
+
+
+def test_parse_filters_repeated_parameters():
+    key = parse_filters(b'alerta=Urgente&alerta=Inmediata')
+    assert key == make_filter_key(None, ['Inmediata', 'Urgente'], None)
+
+
+def test_filter_query_round_trip():
+    key = make_filter_key(['Caribe'], ['Inmediata', 'Urgente'], [BOGOTA, SAN_ANDRES])
+    query = filter_query(key)
+    assert query.startswith('?')
+    assert parse_filters(query[1:].encode('latin-1')) == key
+
+
+def test_summary_with_comma_department(df):
+    key = parse_filters(filter_query(make_filter_key(None, None, [BOGOTA]))[1:].encode('latin-1'))
+    summary = summary_payload(df, key)
+    assert summary['resumen']['total_municipios'] == (df['Departamento'] == BOGOTA).sum() > 0
+    assert list(summary['departamentos']) == [BOGOTA]
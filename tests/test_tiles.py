@@ -0,0 +1,63 @@
+"""Validación de teselas y de filtros en el endpoint de teselas"""
+
+import asyncio
+import os
+
+import pandas as pd
+import pytest
+
+import api
+from benchmarks.synthetic import generate_alerts
+from utils.data_loader import compact_frame, make_filter_key, register_derived
+from utils.filter_index import FilterIndex
+from utils.tiles import get_tile, known_filter_key, tile_in_range
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    data = compact_frame(generate_alerts(300))
+    data.attrs['data_version'] = 'prueba'
+    register_derived('prueba', 'filter_index', FilterIndex(data))
+    return data
+
+
+def _status(path: str) -> int:
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+    asyncio.run(api.app(scope, receive, send))
+    return sent[0]['status']
+
+
+def test_tile_in_range():
+    assert tile_in_range(0, 0, 0)
+    assert tile_in_range(3, 7, 7)
+    assert not tile_in_range(3, 8, 0)
+    assert not tile_in_range(99, 1, 1)
+
+
+@pytest.mark.parametrize('path', ['/tiles/99/1/1.pbf', '/tiles/3/100/100.pbf', f"/tiles/30/{'9' * 400}/1.pbf"])
+def test_out_of_range_tiles_are_not_found(path):
+    assert _status(path) == 404
+
+
+def test_unknown_filter_values_are_dropped(df):
+    department = df['Departamento'].iloc[0]
+    key = make_filter_key(None, None, [department, 'a'])
+    assert known_filter_key(df, key) == ((), (), (department,))
+    assert known_filter_key(df, make_filter_key(None, None, ['a'])) is None
+
+
+def test_empty_tiles_are_not_persisted(df, tmp_path):
+    assert get_tile(df, 4, 0, 0, root=str(tmp_path)) == b''
+    assert get_tile(df, 0, 0, 0, make_filter_key(None, None, ['a']), root=str(tmp_path)) == b''
+    assert not os.listdir(tmp_path)
+
+    assert get_tile(df, 0, 0, 0, root=str(tmp_path))
+    assert os.listdir(tmp_path) == ['prueba']
@@ -9,10 +9,18 @@ from .config import (
     DEFAULT_ZOOM,
     MAP_CONFIG
 )
-from .data_loader import load_electoral_data, get_summary_stats, filter_data
+from .data_loader import (
+    load_electoral_data,
+    get_summary_stats,
+    filter_data,
+    filter_positions,
+    get_data_version,
+    make_filter_key
+)
 
 __all__ = [
     'ALERT_COLORS', 'ALERT_ICONS', 'ALERT_PRIORITY', 'MACROREGIONES',
     'COLOMBIA_CENTER', 'DEFAULT_ZOOM', 'MAP_CONFIG',
-    'load_electoral_data', 'get_summary_stats', 'filter_data'
+    'load_electoral_data', 'get_summary_stats', 'filter_data',
+    'filter_positions', 'get_data_version', 'make_filter_key'
 ]
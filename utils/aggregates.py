@@ -0,0 +1,180 @@
+"""Cubo de conteos Macrorregión × Departamento × Alerta"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .config import ALERT_PRIORITY
+from .data_loader import get_data_version, lookup_derived
+
+
+class AlertCube:
+    """
+    Conteo de municipios por (Macrorregion, Departamento, Llamada a la acción)
+
+    Se construye en una sola pasada sobre el dataset; cualquier combinación
+    de filtros se responde recortando y sumando el cubo, sin volver a las filas.
+
+    Args:
+        counts: Arreglo 3D de conteos
+        macros, depts, alerts: Etiquetas de cada eje
+        cells: Celda (índice plano) de cada fila del dataset, si se conoce
+    """
+
+    def __init__(self, counts: np.ndarray, macros: list, depts: list, alerts: list,
+                 cells: np.ndarray = None):
+        self.counts = counts
+        self.macros = list(macros)
+        self.depts = list(depts)
+        self.alerts = list(alerts)
+        self.cells = cells
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'AlertCube':
+        """Construye el cubo a partir del dataset completo"""
+        macros = sorted(df['Macrorregion'].unique())
+        depts = sorted(df['Departamento'].unique())
+        # Los niveles conocidos siempre forman parte del eje, aunque no aparezcan
+        rank = lambda x: (ALERT_PRIORITY.get(x, len(ALERT_PRIORITY) + 1), x)
+        alerts = sorted(set(df['Llamada a la acción'].unique()) | set(ALERT_PRIORITY), key=rank)
+
+        cube = cls(np.zeros((len(macros), len(depts), len(alerts)), dtype=np.int64), macros, depts, alerts)
+        cube.cells = cube.row_cells(df)
+        cube.counts = np.bincount(cube.cells, minlength=cube.counts.size).reshape(cube.counts.shape)
+        return cube
+
+    def row_cells(self, df: pd.DataFrame) -> np.ndarray:
+        """Celda del cubo (índice plano) de cada fila de df"""
+        coords = tuple(
+            pd.Categorical(df[col], categories=labels).codes
+            for col, labels in (('Macrorregion', self.macros),
+                                ('Departamento', self.depts),
+                                ('Llamada a la acción', self.alerts))
+        )
+        return np.ravel_multi_index(coords, self.counts.shape)
+
+    def subset(self, df: pd.DataFrame, positions: np.ndarray) -> 'AlertCube':
+        """
+        Cubo con los mismos ejes contando solo las filas dadas (p. ej. las
+        visibles en el mapa); se recorta después con select()
+
+        Args:
+            df: Dataset completo con el que se construyó el cubo
+            positions: Posiciones de fila
+        """
+        if self.cells is None or len(self.cells) != len(df):
+            self.cells = self.row_cells(df)
+        counts = np.bincount(self.cells[positions], minlength=self.counts.size).reshape(self.counts.shape)
+        return AlertCube(counts, self.macros, self.depts, self.alerts)
+
+    def select(self, macroregiones: list = None, alertas: list = None,
+               departamentos: list = None) -> 'AlertCube':
+        """Subcubo para una selección de filtros (mismas reglas que filter_data)"""
+        def axis_mask(labels, values):
+            if not values:
+                return np.ones(len(labels), dtype=bool)
+            wanted = set(values)
+            return np.array([label in wanted for label in labels], dtype=bool)
+
+        mm = axis_mask(self.macros, macroregiones)
+        dm = axis_mask(self.depts, departamentos)
+        am = axis_mask(self.alerts, alertas)
+
+        return AlertCube(
+            self.counts[np.ix_(mm, dm, am)],
+            [x for x, keep in zip(self.macros, mm) if keep],
+            [x for x, keep in zip(self.depts, dm) if keep],
+            [x for x, keep in zip(self.alerts, am) if keep]
+        )
+
+    def with_delta(self, removed: pd.DataFrame, added: pd.DataFrame):
+        """
+        Nuevo cubo restando las filas removed y sumando las filas added
+
+        Returns:
+            AlertCube actualizado, o None si aparecen etiquetas fuera de los ejes
+            (en ese caso hay que reconstruirlo con from_frame)
+        """
+        counts = self.counts.copy()
+        for rows, sign in ((removed, -1), (added, 1)):
+            coords = tuple(
+                pd.Categorical(rows[col], categories=labels).codes
+                for col, labels in (('Macrorregion', self.macros),
+                                    ('Departamento', self.depts),
+                                    ('Llamada a la acción', self.alerts))
+            )
+            if any((c < 0).any() for c in coords):
+                return None
+            np.add.at(counts, coords, sign)
+        return AlertCube(counts, self.macros, self.depts, self.alerts)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def alert_counts(self) -> pd.Series:
+        """Municipios por nivel de alerta"""
+        return pd.Series(self.counts.sum(axis=(0, 1)), index=self.alerts)
+
+    def macro_counts(self) -> pd.Series:
+        """Municipios por macrorregión (solo las presentes)"""
+        series = pd.Series(self.counts.sum(axis=(1, 2)), index=self.macros)
+        return series[series > 0]
+
+    def dept_counts(self) -> pd.Series:
+        """Municipios por departamento (solo los presentes)"""
+        series = pd.Series(self.counts.sum(axis=(0, 2)), index=self.depts)
+        return series[series > 0]
+
+    def macro_by_alert(self) -> pd.DataFrame:
+        """Tabla macrorregión × nivel de alerta (solo macrorregiones presentes)"""
+        table = pd.DataFrame(
+            self.counts.sum(axis=1),
+            index=pd.Index(self.macros, name='Macrorregion'),
+            columns=pd.Index(self.alerts, name='Llamada a la acción')
+        )
+        return table[table.sum(axis=1) > 0]
+
+    def dept_counts_for(self, alerts: list) -> pd.Series:
+        """Municipios por departamento con alguno de los niveles dados, de mayor a menor"""
+        am = np.isin(self.alerts, alerts)
+        series = pd.Series(self.counts[:, :, am].sum(axis=(0, 2)), index=self.depts)
+        return series[series > 0].sort_values(ascending=False)
+
+
+def summary_from_cube(cube: AlertCube) -> dict:
+    """
+    Estadísticas resumen (mismas claves que get_summary_stats) a partir del cubo
+
+    Args:
+        cube: AlertCube (completo o recortado con select())
+    """
+    alert_counts = cube.alert_counts()
+    macro_counts = cube.macro_counts()
+    return {
+        'total_municipios': cube.total,
+        'departamentos': len(cube.dept_counts()),
+        'macroregiones': len(macro_counts),
+        'por_alerta': alert_counts[alert_counts > 0].sort_values(ascending=False).to_dict(),
+        'por_macroregion': macro_counts.sort_values(ascending=False).to_dict()
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_alert_cube(_df: pd.DataFrame, data_version: str) -> AlertCube:
+    return AlertCube.from_frame(_df)
+
+
+def get_alert_cube(df: pd.DataFrame) -> AlertCube:
+    """
+    Cubo de conteos del dataset completo, construido una vez por versión de datos
+
+    Debe recibir el DataFrame sin filtrar; los filtros se aplican con select().
+    """
+    data_version = get_data_version(df)
+    if not data_version:
+        return AlertCube.from_frame(df)
+    registered = lookup_derived(data_version, 'alert_cube')
+    if registered is not None:
+        return registered
+    return _cached_alert_cube(df, data_version)
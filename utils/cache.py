@@ -0,0 +1,158 @@
+"""Cachés del dashboard: Parquet en disco y LRU en memoria"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import CACHE_DIR
+
+# Incrementar cuando cambie la limpieza de datos para invalidar cachés previas
+CACHE_FORMAT_VERSION = 3
+
+_META_KEY = b'alerta_electoral'
+
+
+def file_hash(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """Hash SHA-256 del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(filepath: str, content_hash: str, cache_dir: str = CACHE_DIR) -> str:
+    """Ruta del archivo Parquet asociado a una versión del libro"""
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(cache_dir, f"{stem}-v{CACHE_FORMAT_VERSION}-{content_hash[:16]}.parquet")
+
+
+def read_cached_frame(path: str):
+    """
+    Lee un DataFrame desde la caché
+
+    Returns:
+        Tupla (DataFrame, metadatos) o None si la caché no existe o es ilegible
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pq.read_table(path)
+    except (OSError, pa.ArrowException):
+        return None
+
+    raw_meta = (table.schema.metadata or {}).get(_META_KEY, b'{}')
+    return table.to_pandas(), json.loads(raw_meta)
+
+
+def write_cached_frame(df: pd.DataFrame, path: str, meta: dict = None) -> bool:
+    """
+    Escribe un DataFrame en la caché de forma atómica
+
+    Las columnas de texto quedan codificadas por diccionario en Parquet.
+    Elimina versiones anteriores del mismo libro. Devuelve False si el
+    directorio no es escribible (p. ej. contenedores de solo lectura).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = json.dumps(meta or {}).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    directory = os.path.dirname(path)
+    prefix = os.path.basename(path).rsplit('-', 2)[0] + '-v'
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    # Limpiar cachés obsoletas del mismo libro
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        if name.startswith(prefix) and name.endswith('.parquet') and stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return True
+
+
+class ByteBudgetLRU:
+    """
+    Caché LRU en memoria limitada por tamaño total en bytes
+
+    Segura entre hilos: Streamlit atiende cada sesión en un hilo distinto
+    y la instancia se comparte entre todas ellas.
+
+    Args:
+        max_bytes: Presupuesto total; se expulsan las entradas menos recientes
+        sizeof: Función que estima el tamaño de un valor (por defecto len)
+    """
+
+    def __init__(self, max_bytes: int, sizeof=len):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> bool:
+        """Guarda un valor; devuelve False si excede el presupuesto por sí solo"""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= previous[1]
+            self._entries[key] = (value, size)
+            self._total += size
+            while self._total > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total -= evicted_size
+        return True
+
+    def get_or_create(self, key, factory):
+        """Devuelve el valor cacheado o lo construye con factory() y lo guarda"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
@@ -0,0 +1,119 @@
+"""Agrupamiento jerárquico en cuadrícula para el mapa (nivel de detalle por zoom)"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .config import ALERT_PRIORITY, CLUSTER_CONFIG
+
+TILE_SIZE = 256
+
+
+def alert_order() -> list:
+    """Niveles de alerta de mayor a menor prioridad"""
+    return sorted(ALERT_PRIORITY, key=ALERT_PRIORITY.get)
+
+
+def mercator_pixels(lat: np.ndarray, lon: np.ndarray, zoom: int) -> tuple:
+    """Coordenadas en píxeles Web Mercator (como Leaflet) para un nivel de zoom"""
+    scale = TILE_SIZE * 2 ** zoom
+    lat_rad = np.radians(np.clip(lat, -85.0511, 85.0511))
+    x = (lon + 180.0) / 360.0 * scale
+    y = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * scale
+    return x, y
+
+
+def cluster_level(df: pd.DataFrame, zoom: int, cell_px: int = CLUSTER_CONFIG['cell_px']) -> dict:
+    """
+    Agrupa los municipios en celdas de cell_px píxeles para un zoom dado
+
+    Los municipios que quedan solos en su celda no se repiten: se citan por
+    su posición en df y se dibujan con los datos de cluster_points.
+
+    Returns:
+        Diccionario de arreglos columnares por grupo de dos o más municipios:
+        lat, lon (centroide), count, alert (índice en alert_order() de la
+        peor alerta) y breakdown (conteo por nivel de alerta); más 'single',
+        las posiciones de los municipios aislados
+    """
+    alerts = alert_order()
+    lat = df['Latitud'].to_numpy(dtype=float)
+    lon = df['Longitud'].to_numpy(dtype=float)
+    codes = pd.Categorical(df['Llamada a la acción'], categories=alerts).codes
+
+    x, y = mercator_pixels(lat, lon, zoom)
+    # Celda como un único entero (columna en los bits altos): np.unique 1-D es mucho más rápido
+    cells = ((x // cell_px).astype(np.int64) << 32) | (y // cell_px).astype(np.int64)
+    _, first, inverse = np.unique(cells, return_index=True, return_inverse=True)
+    n_groups = len(first)
+
+    count = np.bincount(inverse, minlength=n_groups)
+    mean_lat = np.bincount(inverse, weights=lat, minlength=n_groups) / count
+    mean_lon = np.bincount(inverse, weights=lon, minlength=n_groups) / count
+
+    # Conteo por nivel y peor alerta (primer nivel con presencia)
+    valid = codes >= 0
+    breakdown = np.bincount(
+        inverse[valid] * len(alerts) + codes[valid],
+        minlength=n_groups * len(alerts)
+    ).reshape(n_groups, len(alerts))
+    worst = np.argmax(breakdown > 0, axis=1)
+
+    grouped = count > 1
+    return {
+        'lat': np.round(mean_lat[grouped], 5).tolist(),
+        'lon': np.round(mean_lon[grouped], 5).tolist(),
+        'count': count[grouped].tolist(),
+        'alert': worst[grouped].tolist(),
+        'breakdown': breakdown[grouped].tolist(),
+        'single': np.sort(first[~grouped]).tolist()
+    }
+
+
+def cluster_points(df: pd.DataFrame) -> dict:
+    """
+    Datos por municipio de la capa agrupada, incrustados una sola vez
+
+    Returns:
+        Arreglos columnares lat, lon, label (municipio) y alert (índice en
+        alert_order(), -1 si el nivel no se reconoce)
+    """
+    return {
+        'lat': df['Latitud'].to_numpy(dtype='float64').round(6).tolist(),
+        'lon': df['Longitud'].to_numpy(dtype='float64').round(6).tolist(),
+        'label': df['Municipio'].astype(str).tolist(),
+        'alert': pd.Categorical(df['Llamada a la acción'], categories=alert_order()).codes.tolist()
+    }
+
+
+def build_cluster_levels(df: pd.DataFrame,
+                         min_zoom: int = CLUSTER_CONFIG['min_zoom'],
+                         points_zoom: int = CLUSTER_CONFIG['points_zoom'],
+                         cell_px: int = CLUSTER_CONFIG['cell_px']) -> dict:
+    """
+    Grupos precalculados para los zooms gruesos, de min_zoom a points_zoom - 1
+
+    Desde points_zoom el mapa dibuja cada municipio con cluster_points.
+    """
+    return {zoom: cluster_level(df, zoom, cell_px) for zoom in range(min_zoom, points_zoom)}
+
+
+def clustering_saves_payload(df: pd.DataFrame, levels: dict = None) -> bool:
+    """
+    Indica si la capa agrupada pesa menos que las capas de puntos
+
+    Ambas incrustan coordenadas y nombre de cada municipio; la agrupada
+    agrega los niveles gruesos y las de puntos el departamento, la
+    macrorregión y el código que muestran sus popups.
+    """
+    if df.empty:
+        return False
+    if levels is None:
+        levels = build_cluster_levels(df)
+    extra = {col: df[col].tolist() for col in ('Departamento', 'Macrorregion', 'Codigo Divipola')}
+    return _json_size(levels) < _json_size(extra)
+
+
+def _json_size(payload) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
@@ -1,4 +1,5 @@
 # Configuración global del dashboard
+import os
 
 # Paleta de colores por nivel de alerta
 ALERT_COLORS = {
@@ -27,6 +28,9 @@ ALERT_PRIORITY = {
     'Ordinaria': 5
 }
 
+# Niveles considerados críticos (rankings y mapa de calor)
+CRITICAL_ALERTS = ['Inmediata', 'Urgente']
+
 # Macrorregiones de Colombia
 MACROREGIONES = [
     'Amazónica',
@@ -46,10 +50,123 @@ DEFAULT_ZOOM = 6
 MAP_CONFIG = {
     'tiles': 'CartoDB positron',
     'width': 1400,
-    'height': 700
+    'height': 700,
+    'focus_zoom': 10         # Zoom al ir a un municipio desde la búsqueda
+}
+
+# Agrupamiento de marcadores por zoom (cuadrícula en píxeles Web Mercator)
+CLUSTER_CONFIG = {
+    'min_zoom': 4,
+    'points_zoom': 8,   # Desde este zoom se dibuja cada municipio en lugar de los grupos
+    'cell_px': 48
 }
 
+# Mapa de calor: rejilla de densidad con kernel gaussiano
+HEATMAP_CONFIG = {
+    'cell_deg': 0.2,         # Tamaño de celda en grados
+    'bandwidth_deg': 0.25,   # Desviación estándar del kernel en grados
+    'weights': {             # Peso por nivel (niveles ausentes no aportan)
+        'Inmediata': 1.0,
+        'Urgente': 0.6
+    },
+    'min_weight': 0.15       # Umbral relativo para descartar celdas casi vacías
+}
+
+# Panel de rendimiento: visible con ?admin=1 en la URL
+ADMIN_QUERY_PARAM = 'admin'
+
+# Historial de boletines (un archivo Parquet por boletín)
+HISTORY_DIR = 'data/history'
+
 # Títulos y textos
-DASHBOARD_TITLE = "🗳️ Alerta Temprana Electoral N°013-25"
+CURRENT_BULLETIN = "N°013-25"
+DASHBOARD_TITLE = f"🗳️ Alerta Temprana Electoral {CURRENT_BULLETIN}"
 DASHBOARD_SUBTITLE = "Monitoreo de Riesgos Electorales 2025-2026"
-DATA_SOURCE = "Fuente: Defensoría del Pueblo"
\ No newline at end of file
+DATA_SOURCE = "Fuente: Defensoría del Pueblo"
+
+# Fuente de datos y caché columnar en disco
+DATA_FILE = 'data/alerta_georeferenciada.xlsx'
+CACHE_DIR = 'data/.cache'
+
+# Intervalo mínimo (segundos) entre comprobaciones de cambios en DATA_FILE
+REFRESH_CHECK_SECONDS = 10
+
+# Directorio del dataset compartido entre procesos (utils.shared); vacío = desactivado
+SHARED_DATA_DIR = os.environ.get('ALERTA_SHARED_DIR', '')
+
+# Instantáneas estáticas (snapshot.py): directorio servido por Streamlit en
+# /app/static/snapshot/ y vistas filtradas adicionales a la vista general
+SNAPSHOT_DIR = 'static/snapshot'
+SNAPSHOT_PRESETS = {
+    'criticas': {'titulo': 'Alertas críticas', 'alertas': CRITICAL_ALERTS},
+    'amazonica': {'titulo': 'Macrorregión Amazónica', 'macroregiones': ['Amazónica']},
+    'caribe': {'titulo': 'Macrorregión Caribe', 'macroregiones': ['Caribe']},
+    'centro-andina': {'titulo': 'Macrorregión Centro Andina', 'macroregiones': ['Centro Andina']},
+    'noroccidente': {'titulo': 'Macrorregión Noroccidente', 'macroregiones': ['Noroccidente']},
+    'nororiente': {'titulo': 'Macrorregión Nororiente', 'macroregiones': ['Nororiente']},
+    'orinoquia': {'titulo': 'Macrorregión Orinoquía', 'macroregiones': ['Orinoquía']},
+    'sur-occidente': {'titulo': 'Macrorregión Sur Occidente', 'macroregiones': ['Sur Occidente']}
+}
+
+# Presupuesto de la caché de HTML y mapas serializados (compartida entre sesiones)
+MAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Presupuesto de la caché de archivos de exportación generados
+EXPORT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# API HTTP (api.py): caché de respuestas y tamaño mínimo para comprimir con gzip
+API_CACHE_MAX_BYTES = 32 * 1024 * 1024
+API_GZIP_MIN_BYTES = 1024
+
+# Parámetros de filtro de la API, en el orden de make_filter_key
+API_FILTER_PARAMS = ('macroregion', 'alerta', 'departamento')
+
+# Teselas vectoriales (utils.tiles): extensión y margen en unidades de tesela,
+# celda para fundir puntos cercanos y rango de zoom generado por adelantado
+TILE_CONFIG = {
+    'extent': 4096,
+    'buffer': 64,
+    'cell': 16,
+    'min_zoom': 4,
+    'max_zoom': 10,
+    'max_native_zoom': 14,   # Zoom máximo que se sirve; el mapa amplía esas teselas más allá
+    'source_cache_bytes': 64 * 1024 * 1024
+}
+
+# Índice espacial: lado de la celda en grados (~28 km) y radio por defecto de búsqueda
+SPATIAL_CONFIG = {
+    'cell_deg': 0.25,
+    'default_radius_km': 50,
+    'click_tolerance_km': 10    # Distancia máxima de un clic en el mapa a su municipio
+}
+
+# Focos de alertas críticas (Gi*): radio del vecindario, significancia y
+# corrección por comparaciones múltiples (Benjamini-Hochberg)
+HOTSPOT_CONFIG = {
+    'band_km': 40,
+    'alpha': 0.05,
+    'fdr': True
+}
+
+# Tabla detallada: columnas (todas ordenables) y tamaños de página
+TABLE_CONFIG = {
+    'columns': ['Departamento', 'Municipio', 'Macrorregion', 'Llamada a la acción', 'Codigo Divipola'],
+    'default_sort': 'Departamento',
+    'page_sizes': [25, 50, 100, 200],
+    'page_size': 50
+}
+
+# Límites municipales (GeoJSON, p. ej. MGN del DANE) para el mapa de coropletas
+BOUNDARY_FILE = 'data/municipios.geojson'
+
+# Coropletas: propiedad con el código Divipola, rejilla de cuantización y
+# niveles de detalle (zoom mínimo, tolerancia de simplificación en grados)
+CHOROPLETH_CONFIG = {
+    'code_property': 'MPIO_CDPMP',
+    'quantization': 100_000,
+    'levels': [(0, 0.02), (7, 0.005), (9, 0.001)]
+}
+
+# Plantilla de URL del endpoint de teselas (p. ej. http://localhost:8000/tiles/{z}/{x}/{y}.pbf);
+# vacío = el mapa incrusta los puntos en el HTML
+TILE_URL = os.environ.get('ALERTA_TILE_URL', '')
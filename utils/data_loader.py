@@ -1,39 +1,137 @@
+from collections import OrderedDict
+
 import pandas as pd
 import streamlit as st
+from .cache import file_hash, cache_path, read_cached_frame, write_cached_frame
+from .config import ALERT_PRIORITY, DATA_FILE
+from .filter_index import FilterIndex
+
+REQUIRED_COLUMNS = ['Codigo Divipola', 'Departamento', 'Municipio',
+                    'Macrorregion', 'Llamada a la acción', 'Latitud', 'Longitud']
+
+CATEGORY_COLUMNS = ['Departamento', 'Municipio', 'Macrorregion']
+INTEGER_COLUMNS = ['Codigo Divipola', 'Código Municipio']
+
+
+def alert_dtype(values=()) -> pd.CategoricalDtype:
+    """
+    Tipo categórico ordenado de 'Llamada a la acción' (orden de ALERT_PRIORITY)
+
+    Niveles desconocidos se agregan al final para no perder datos.
+    """
+    known = sorted(ALERT_PRIORITY, key=ALERT_PRIORITY.get)
+    extra = sorted(set(values) - set(known))
+    return pd.CategoricalDtype(known + extra, ordered=True)
+
+
+def parse_coordinate(values: pd.Series) -> pd.Series:
+    """
+    Coordenadas a float64; acepta números o texto con coma decimal
+
+    Se conserva float64: en float32 un valor como -75.581775 ya no se puede
+    recuperar y las exportaciones dejarían de coincidir con el boletín.
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype('string').str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(values, errors='coerce').astype('float64')
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Representación compacta del dataset
+
+    Texto repetido como categorías, nivel de alerta como categoría ordenada,
+    códigos enteros int32 (las coordenadas se mantienen en float64). Es idempotente.
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    alerts = df['Llamada a la acción']
+    df['Llamada a la acción'] = alerts.astype(alert_dtype(alerts.dropna().unique()))
+
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            codes = pd.to_numeric(df[col], errors='coerce')
+            if codes.notna().all():
+                df[col] = codes.astype('int32')
+
+    return df
+
+
+def _read_workbook(filepath: str) -> tuple:
+    """
+    Lee y limpia el libro de Excel
+
+    Returns:
+        Tupla (DataFrame limpio, registros excluidos)
+    
+    Raises:
+        ValueError: Si faltan columnas requeridas
+    """
+    df = pd.read_excel(filepath)
+
+    missing = set(REQUIRED_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Columnas faltantes: {missing}")
+
+    # Conversión de coordenadas (texto con coma decimal o números) a float64
+    df['Latitud'] = parse_coordinate(df['Latitud'])
+    df['Longitud'] = parse_coordinate(df['Longitud'])
+
+    # Eliminar registros sin coordenadas válidas
+    initial_count = len(df)
+    df = df.dropna(subset=['Latitud', 'Longitud']).reset_index(drop=True)
+
+    return compact_frame(df), initial_count - len(df)
+
+
+def read_electoral_data(filepath: str = DATA_FILE, content_hash: str = None) -> tuple:
+    """
+    Lee el dataset limpio desde la caché Parquet o, si no existe, desde el libro
+
+    El resultado limpio se persiste en una caché Parquet indexada por el
+    hash del libro; solo se vuelve a leer el Excel cuando el archivo cambia.
+
+    Returns:
+        Tupla (DataFrame con attrs['data_version'], registros excluidos)
+
+    Raises:
+        FileNotFoundError: Si el libro no existe
+        ValueError: Si faltan columnas requeridas
+    """
+    content_hash = content_hash or file_hash(filepath)
+    parquet_path = cache_path(filepath, content_hash)
+    cached = read_cached_frame(parquet_path)
+
+    if cached is not None:
+        df, meta = cached
+        dropped = meta.get('dropped', 0)
+    else:
+        df, dropped = _read_workbook(filepath)
+        write_cached_frame(df, parquet_path, {'source': filepath, 'dropped': dropped})
+
+    # La versión de datos viaja con el DataFrame (y sus filtrados)
+    df.attrs['data_version'] = content_hash[:16]
+    return df, dropped
+
 
-@st.cache_data
-def load_electoral_data(filepath: str = 'data/alerta_georeferenciada.xlsx') -> pd.DataFrame:
-    """Carga y valida datos de alerta electoral"""
+def load_electoral_data(filepath: str = DATA_FILE) -> pd.DataFrame:
+    """
+    Carga y valida datos de alerta electoral
+
+    Lectura directa, sin caché en memoria; el dashboard usa
+    utils.refresh.get_electoral_data, que la comparte entre sesiones y
+    detecta cambios del archivo.
+    """
     try:
-        df = pd.read_excel(filepath)
-        
-        required_cols = ['Codigo Divipola', 'Departamento', 'Municipio', 
-                        'Macrorregion', 'Llamada a la acción', 'Latitud', 'Longitud']
-        
-        missing = set(required_cols) - set(df.columns)
-        if missing:
-            st.error(f"Columnas faltantes: {missing}")
-            return pd.DataFrame()
-        
-        # Conversión de coordenadas desde string
-        # Limpiar espacios y reemplazar comas por puntos
-        df['Latitud'] = df['Latitud'].astype(str).str.strip().str.replace(',', '.')
-        df['Longitud'] = df['Longitud'].astype(str).str.strip().str.replace(',', '.')
-        
-        # Convertir a numérico
-        df['Latitud'] = pd.to_numeric(df['Latitud'], errors='coerce')
-        df['Longitud'] = pd.to_numeric(df['Longitud'], errors='coerce')
-        
-        # Eliminar registros sin coordenadas válidas
-        initial_count = len(df)
-        df = df.dropna(subset=['Latitud', 'Longitud'])
-        dropped = initial_count - len(df)
-        
+        df, dropped = read_electoral_data(filepath)
+
         if dropped > 0:
             st.warning(f"⚠️ Se excluyeron {dropped} municipios sin coordenadas válidas")
-        
+
         return df
-    
+
     except FileNotFoundError:
         st.error(f"❌ Archivo no encontrado: {filepath}")
         return pd.DataFrame()
@@ -42,31 +140,101 @@ def load_electoral_data(filepath: str = 'data/alerta_georeferenciada.xlsx') -> p
         return pd.DataFrame()
 
 
+def get_data_version(df: pd.DataFrame) -> str:
+    """Versión (hash de contenido) de los datos de origen del DataFrame"""
+    return df.attrs.get('data_version', '')
+
+
+def make_filter_key(macroregiones: list = None,
+                    alertas: list = None,
+                    departamentos: list = None) -> tuple:
+    """
+    Clave normalizada e inmutable de una selección de filtros
+
+    Las listas vacías equivalen a "sin filtro" y el orden de selección no importa.
+    """
+    return tuple(tuple(sorted(values)) if values else () for values in (macroregiones, alertas, departamentos))
+
+
+# Estructuras derivadas (índices, cubos) registradas por versión de datos.
+# Permite que una actualización incremental publique las suyas sin reconstruirlas.
+_DERIVED = OrderedDict()
+_DERIVED_VERSIONS_KEPT = 4
+
+
+def register_derived(data_version: str, name: str, value):
+    """Registra una estructura derivada para una versión de datos"""
+    _DERIVED.setdefault(data_version, {})[name] = value
+    _DERIVED.move_to_end(data_version)
+    while len(_DERIVED) > _DERIVED_VERSIONS_KEPT:
+        _DERIVED.popitem(last=False)
+
+
+def lookup_derived(data_version: str, name: str):
+    """Estructura derivada registrada para una versión de datos, o None"""
+    return _DERIVED.get(data_version, {}).get(name)
+
+
 def get_summary_stats(df: pd.DataFrame) -> dict:
-    """Calcula estadísticas resumen del dataset"""
+    """
+    Calcula estadísticas resumen del dataset
+
+    Para el dashboard y la API, que ya tienen el cubo de conteos, ver
+    aggregates.summary_from_cube (mismo resultado sin recorrer las filas).
+    """
+    def present_counts(col):
+        counts = df[col].value_counts()
+        return counts[counts > 0].to_dict()
+
     return {
         'total_municipios': len(df),
         'departamentos': df['Departamento'].nunique(),
         'macroregiones': df['Macrorregion'].nunique(),
-        'por_alerta': df['Llamada a la acción'].value_counts().to_dict(),
-        'por_macroregion': df['Macrorregion'].value_counts().to_dict()
+        'por_alerta': present_counts('Llamada a la acción'),
+        'por_macroregion': present_counts('Macrorregion')
     }
 
 
-def filter_data(df: pd.DataFrame, 
-                macroregiones: list = None, 
+@st.cache_resource(show_spinner=False)
+def _cached_filter_index(_df: pd.DataFrame, data_version: str) -> FilterIndex:
+    return FilterIndex(_df)
+
+
+def get_filter_index(df: pd.DataFrame) -> FilterIndex:
+    """Índice de filtros del dataset, construido una vez por versión de datos"""
+    data_version = get_data_version(df)
+    if not data_version:
+        return FilterIndex(df)
+    registered = lookup_derived(data_version, 'filter_index')
+    if registered is not None:
+        return registered
+    return _cached_filter_index(df, data_version)
+
+
+def filter_positions(df: pd.DataFrame,
+                     macroregiones: list = None,
+                     alertas: list = None,
+                     departamentos: list = None):
+    """Posiciones de fila que cumplen los filtros, o None si no hay filtros activos"""
+    return get_filter_index(df).positions({
+        'Macrorregion': macroregiones,
+        'Llamada a la acción': alertas,
+        'Departamento': departamentos
+    })
+
+
+def filter_data(df: pd.DataFrame,
+                macroregiones: list = None,
                 alertas: list = None,
                 departamentos: list = None) -> pd.DataFrame:
-    """Aplica filtros múltiples al dataset"""
-    filtered = df.copy()
-    
-    if macroregiones:
-        filtered = filtered[filtered['Macrorregion'].isin(macroregiones)]
-    
-    if alertas:
-        filtered = filtered[filtered['Llamada a la acción'].isin(alertas)]
-    
-    if departamentos:
-        filtered = filtered[filtered['Departamento'].isin(departamentos)]
-    
-    return filtered
+    """
+    Aplica filtros múltiples al dataset
+
+    Usa el índice de bitmaps precalculado; sin filtros activos devuelve el
+    mismo DataFrame sin copiarlo.
+    """
+    positions = filter_positions(df, macroregiones, alertas, departamentos)
+
+    if positions is None:
+        return df
+    return df.take(positions)
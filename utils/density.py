@@ -0,0 +1,76 @@
+"""Densidad de alertas en rejilla (kernel gaussiano) para el mapa de calor"""
+
+import numpy as np
+import pandas as pd
+
+from .config import HEATMAP_CONFIG
+
+
+def gaussian_kernel(sigma_cells: float) -> np.ndarray:
+    """Kernel gaussiano 1D normalizado, truncado a 3 sigmas"""
+    radius = max(1, int(np.ceil(3 * sigma_cells)))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma_cells) ** 2)
+    return kernel / kernel.sum()
+
+
+def smooth(grid: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolución separable (filas y columnas) con bordes en cero"""
+    radius = len(kernel) // 2
+    for axis in (0, 1):
+        padded = np.pad(grid, [(radius, radius) if a == axis else (0, 0) for a in (0, 1)])
+        out = np.zeros_like(grid)
+        for tap, weight in enumerate(kernel):
+            window = [slice(None), slice(None)]
+            window[axis] = slice(tap, tap + grid.shape[axis])
+            out += weight * padded[tuple(window)]
+        grid = out
+    return grid
+
+
+def density_grid(lat: np.ndarray, lon: np.ndarray, weights: np.ndarray,
+                 cell_deg: float, bandwidth_deg: float) -> tuple:
+    """
+    Rejilla de densidad suavizada
+
+    Returns:
+        Tupla (grid, centros de latitud, centros de longitud)
+    """
+    pad = 3 * bandwidth_deg + cell_deg
+    lat_edges = np.arange(lat.min() - pad, lat.max() + pad + cell_deg, cell_deg)
+    lon_edges = np.arange(lon.min() - pad, lon.max() + pad + cell_deg, cell_deg)
+
+    grid, _, _ = np.histogram2d(lat, lon, bins=[lat_edges, lon_edges], weights=weights)
+    grid = smooth(grid, gaussian_kernel(bandwidth_deg / cell_deg))
+
+    return grid, (lat_edges[:-1] + lat_edges[1:]) / 2, (lon_edges[:-1] + lon_edges[1:]) / 2
+
+
+def heat_points(df: pd.DataFrame, config: dict = HEATMAP_CONFIG) -> list:
+    """
+    Puntos ponderados [lat, lon, peso] de la densidad de alertas
+
+    Los pesos se normalizan a [0, 1] y se descartan celdas por debajo de
+    config['min_weight'], de modo que el navegador recibe una rejilla
+    compacta en lugar de todos los municipios.
+    """
+    weights = df['Llamada a la acción'].astype(object).map(config['weights']).fillna(0).to_numpy(dtype=float)
+    mask = weights > 0
+    if not mask.any():
+        return []
+
+    grid, lat_centers, lon_centers = density_grid(
+        df['Latitud'].to_numpy(dtype=float)[mask],
+        df['Longitud'].to_numpy(dtype=float)[mask],
+        weights[mask],
+        config['cell_deg'],
+        config['bandwidth_deg']
+    )
+
+    grid = grid / grid.max()
+    rows, cols = np.nonzero(grid >= config['min_weight'])
+    return np.column_stack([
+        np.round(lat_centers[rows], 4),
+        np.round(lon_centers[cols], 4),
+        np.round(grid[rows, cols], 3)
+    ]).tolist()
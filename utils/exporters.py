@@ -0,0 +1,106 @@
+"""Serialización de datos filtrados para descarga"""
+
+import json
+from io import BytesIO, StringIO
+
+import pandas as pd
+
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Recorre el DataFrame en bloques de chunk_rows filas"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def to_csv_bytes(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> bytes:
+    """CSV UTF-8 escrito por bloques para acotar la memoria intermedia"""
+    out = BytesIO()
+    out.write(df.iloc[:0].to_csv(index=False).encode('utf-8'))
+    for chunk in iter_chunks(df, chunk_rows):
+        text = StringIO()
+        chunk.to_csv(text, index=False, header=False)
+        out.write(text.getvalue().encode('utf-8'))
+    return out.getvalue()
+
+
+def to_xlsx_bytes(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> bytes:
+    """
+    Libro de Excel generado con openpyxl en modo write-only
+
+    Las filas se vuelcan en streaming sin construir el árbol de celdas en
+    memoria, mucho más rápido que DataFrame.to_excel con openpyxl.
+    """
+    # openpyxl solo se carga al exportar, no al arrancar
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+
+    header = []
+    for name in df.columns:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+
+    for chunk in iter_chunks(df, chunk_rows):
+        # NaN no es válido en xlsx: se escribe como celda vacía
+        if chunk.isna().to_numpy().any():
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def to_geojson_bytes(df: pd.DataFrame,
+                     properties: tuple = ('Departamento', 'Municipio', 'Macrorregion',
+                                          'Llamada a la acción', 'Codigo Divipola'),
+                     chunk_rows: int = EXPORT_CHUNK_ROWS) -> bytes:
+    """
+    FeatureCollection GeoJSON con un punto por municipio
+
+    Las propiedades se leen columna a columna y las coordenadas se
+    redondean a 6 decimales, la precisión del boletín.
+    """
+    out = BytesIO()
+    out.write(b'{"type":"FeatureCollection","features":[')
+    first = True
+    for chunk in iter_chunks(df, chunk_rows):
+        lons = chunk['Longitud'].to_numpy(dtype='float64').round(6).tolist()
+        lats = chunk['Latitud'].to_numpy(dtype='float64').round(6).tolist()
+        columns = [chunk[col].astype(object).where(chunk[col].notna(), None).tolist() for col in properties]
+        for lon, lat, *values in zip(lons, lats, *columns):
+            feature = {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': dict(zip(properties, values))
+            }
+            if not first:
+                out.write(b',')
+            out.write(json.dumps(feature, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            first = False
+    out.write(b']}')
+    return out.getvalue()
+
+
+EXPORT_FORMATS = {
+    'csv': {
+        'label': '📄 CSV',
+        'writer': to_csv_bytes,
+        'file_name': 'alerta_electoral_filtrado.csv',
+        'mime': 'text/csv'
+    },
+    'xlsx': {
+        'label': '📊 Excel',
+        'writer': to_xlsx_bytes,
+        'file_name': 'alerta_electoral_filtrado.xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    }
+}
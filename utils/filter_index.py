@@ -0,0 +1,103 @@
+"""Índice de bitmaps para filtrar el dataset sin recorrerlo"""
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ('Macrorregion', 'Llamada a la acción', 'Departamento')
+
+
+class FilterIndex:
+    """
+    Bitmaps empaquetados (1 bit por fila) por cada valor de las columnas filtrables
+
+    Un filtro se resuelve como OR de los bitmaps de los valores elegidos en
+    cada columna y AND entre columnas; el resultado son posiciones de fila.
+
+    Args:
+        df: DataFrame con índice posicional (0..n-1)
+        columns: Columnas a indexar
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: tuple = FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col])
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(uniques)
+            }
+
+    @classmethod
+    def from_bitmaps(cls, n_rows: int, bitmaps: dict) -> 'FilterIndex':
+        """Índice a partir de bitmaps ya empaquetados (p. ej. mapeados en memoria)"""
+        index = cls.__new__(cls)
+        index.n_rows = n_rows
+        index.bitmaps = bitmaps
+        return index
+
+    def with_changes(self, df: pd.DataFrame, positions: np.ndarray) -> 'FilterIndex':
+        """
+        Nuevo índice para df recalculando solo las filas en positions
+
+        df debe conservar las posiciones del DataFrame indexado; puede tener
+        filas nuevas al final (que deben figurar en positions).
+        """
+        updated = FilterIndex.__new__(FilterIndex)
+        updated.n_rows = len(df)
+        updated.bitmaps = {}
+        positions = np.asarray(positions, dtype=np.int64)
+
+        same_size = updated.n_rows == self.n_rows
+
+        for col, bitmaps in self.bitmaps.items():
+            new_values = df[col].to_numpy()[positions]
+            touched = set(new_values)
+            updated.bitmaps[col] = {}
+            for value in set(bitmaps) | touched:
+                old = bitmaps.get(value)
+                # Bitmaps sin filas afectadas se comparten tal cual (son inmutables)
+                if same_size and old is not None and value not in touched:
+                    if not (old[positions >> 3] >> (7 - (positions & 7)) & 1).any():
+                        updated.bitmaps[col][value] = old
+                        continue
+                bits = np.zeros(updated.n_rows, dtype=bool)
+                if old is not None:
+                    bits[:self.n_rows] = np.unpackbits(old, count=self.n_rows).astype(bool)
+                bits[positions] = new_values == value
+                if bits.any():
+                    updated.bitmaps[col][value] = np.packbits(bits)
+        return updated
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def mask(self, col: str, values) -> np.ndarray:
+        """Bitmap empaquetado de las filas cuyo valor en col está en values"""
+        result = self._empty()
+        for value in values:
+            bitmap = self.bitmaps[col].get(value)
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def positions(self, selections: dict) -> np.ndarray:
+        """
+        Posiciones de las filas que cumplen todos los filtros
+
+        Args:
+            selections: {columna: valores}; valores vacíos o None no filtran
+
+        Returns:
+            Arreglo ordenado de posiciones, o None si no hay filtros activos
+        """
+        combined = None
+        for col, values in selections.items():
+            if not values:
+                continue
+            current = self.mask(col, values)
+            combined = current if combined is None else np.bitwise_and(combined, current, out=combined)
+
+        if combined is None:
+            return None
+        return np.flatnonzero(np.unpackbits(combined, count=self.n_rows))
@@ -0,0 +1,304 @@
+"""
+Límites municipales simplificados para el mapa de coropletas
+
+El archivo de límites (GeoJSON, p. ej. el MGN del DANE) se convierte una
+sola vez en una topología al estilo TopoJSON:
+
+- las coordenadas se cuantizan a una rejilla entera;
+- los anillos se cortan en arcos en los puntos donde se unen tres o más
+  municipios, y cada frontera compartida se guarda una sola vez;
+- cada arco se simplifica (Douglas-Peucker) para cada nivel de detalle.
+
+Como los municipios vecinos comparten el mismo arco simplificado, no
+aparecen huecos ni solapes entre ellos en ningún nivel. El resultado se
+guarda en CACHE_DIR por contenido del archivo de límites.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .cache import file_hash
+from .config import ALERT_PRIORITY, BOUNDARY_FILE, CACHE_DIR, CHOROPLETH_CONFIG
+
+# Incrementar cuando cambie la construcción de la topología
+GEOMETRY_FORMAT_VERSION = 1
+
+
+# --- Lectura y cuantización ---
+
+def read_boundaries(filepath: str = BOUNDARY_FILE,
+                    code_property: str = CHOROPLETH_CONFIG['code_property']) -> list:
+    """
+    Lee los polígonos del archivo de límites
+
+    Returns:
+        Lista de (código Divipola, [polígono: [anillo: arreglo (n, 2) lon/lat]])
+    """
+    with open(filepath, encoding='utf-8') as fh:
+        collection = json.load(fh)
+
+    features = []
+    for feature in collection['features']:
+        geometry = feature.get('geometry') or {}
+        raw_code = (feature.get('properties') or {}).get(code_property, feature.get('id'))
+        if raw_code is None or geometry.get('type') not in ('Polygon', 'MultiPolygon'):
+            continue
+        polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+        features.append((int(raw_code), [[np.asarray(ring, dtype=float)[:, :2] for ring in polygon]
+                                         for polygon in polygons]))
+    return features
+
+
+def _quantize(features: list, quantization: int) -> tuple:
+    """Anillos en coordenadas enteras, sin puntos consecutivos repetidos"""
+    all_points = np.concatenate([ring for _, polygons in features for polygon in polygons for ring in polygon])
+    x0, y0 = all_points.min(axis=0)
+    x1, y1 = all_points.max(axis=0)
+    kx = (x1 - x0) / (quantization - 1) or 1.0
+    ky = (y1 - y0) / (quantization - 1) or 1.0
+
+    quantized = []
+    for code, polygons in features:
+        q_polygons = []
+        for polygon in polygons:
+            q_rings = []
+            for ring in polygon:
+                q = np.round((ring - (x0, y0)) / (kx, ky)).astype(np.int64)
+                q = q[np.r_[True, (np.diff(q, axis=0) != 0).any(axis=1)]]
+                if len(q) >= 4:
+                    q_rings.append([tuple(p) for p in q.tolist()])
+            if q_rings:
+                q_polygons.append(q_rings)
+        if q_polygons:
+            quantized.append((code, q_polygons))
+
+    return quantized, {'scale': [kx, ky], 'translate': [x0, y0]}
+
+
+# --- Topología ---
+
+def _open_ring(ring: list) -> list:
+    return ring[:-1] if ring[0] == ring[-1] else ring
+
+
+def _junctions(rings: list) -> set:
+    """Puntos donde cambia el vecino a lo largo de algún anillo (uniones de fronteras)"""
+    neighbors = {}
+    junctions = set()
+    for ring in rings:
+        points = _open_ring(ring)
+        n = len(points)
+        for i, point in enumerate(points):
+            prev_point, next_point = points[i - 1], points[(i + 1) % n]
+            pair = (prev_point, next_point) if prev_point < next_point else (next_point, prev_point)
+            seen = neighbors.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut(ring: list, junctions: set) -> list:
+    """Corta un anillo en arcos que empiezan y terminan en uniones"""
+    points = _open_ring(ring)
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    if not cuts:
+        # Anillo sin uniones (isla o enclave): arranca en su punto mínimo
+        start = points.index(min(points))
+        rotated = points[start:] + points[:start]
+        return [rotated + [rotated[0]]]
+
+    rotated = points[cuts[0]:] + points[:cuts[0]]
+    cuts = [i - cuts[0] for i in cuts] + [len(points)]
+    closed = rotated + [rotated[0]]
+    return [closed[a:b + 1] for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+def build_topology(features: list, quantization: int = CHOROPLETH_CONFIG['quantization']) -> dict:
+    """
+    Arcos compartidos y objetos (municipios) que los referencian
+
+    Returns:
+        Diccionario con 'transform', 'arcs' (listas de puntos enteros),
+        'objects' ([{code, polygons: [[ids de arco]]}]; ~id = arco invertido)
+        y 'owners' (códigos que usan cada arco)
+    """
+    quantized, transform = _quantize(features, quantization)
+    junctions = _junctions([ring for _, polygons in quantized for polygon in polygons for ring in polygon])
+
+    arcs, arc_ids, owners, objects = [], {}, [], []
+    for code, polygons in quantized:
+        q_polygons = []
+        for polygon in polygons:
+            q_rings = []
+            for ring in polygon:
+                ids = []
+                for arc in _cut(ring, junctions):
+                    key = tuple(arc)
+                    arc_id = arc_ids.get(key)
+                    if arc_id is None:
+                        reverse_id = arc_ids.get(key[::-1])
+                        if reverse_id is not None:
+                            arc_id = ~reverse_id
+                        else:
+                            arc_id = arc_ids[key] = len(arcs)
+                            arcs.append(arc)
+                            owners.append(set())
+                    owners[arc_id if arc_id >= 0 else ~arc_id].add(code)
+                    ids.append(arc_id)
+                q_rings.append(ids)
+            q_polygons.append(q_rings)
+        objects.append({'code': code, 'polygons': q_polygons})
+
+    return {'transform': transform, 'arcs': arcs, 'objects': objects, 'owners': owners}
+
+
+# --- Simplificación ---
+
+def simplify_arc(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker sobre un arco (conserva los extremos)
+
+    Los arcos cerrados conservan al menos cuatro puntos para no degenerar.
+    """
+    n = len(points)
+    if n <= 2:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        a, b = points[start], points[end]
+        segment = points[start + 1:end] - a
+        direction = b - a
+        norm = np.hypot(*direction)
+        if norm == 0:
+            dist = np.hypot(segment[:, 0], segment[:, 1])
+        else:
+            dist = np.abs(direction[0] * segment[:, 1] - direction[1] * segment[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            k = start + 1 + i
+            keep[k] = True
+            stack += [(start, k), (k, end)]
+
+    if keep.sum() < 4 and n >= 4 and (points[0] == points[-1]).all():
+        keep[[n // 3, 2 * n // 3]] = True
+    return points[keep]
+
+
+def _delta_encode(points: np.ndarray) -> list:
+    """Arco como lista plana [x0, y0, dx1, dy1, ...]"""
+    return np.diff(points, axis=0, prepend=[[0, 0]]).ravel().tolist()
+
+
+def simplified_topology(features: list, config: dict = CHOROPLETH_CONFIG) -> dict:
+    """
+    Topología con un juego de arcos simplificados por nivel de detalle
+
+    Returns:
+        Diccionario serializable: transform, levels ([{min_zoom, arcs}]),
+        objects y dept_mesh (arcos que separan departamentos o dan al exterior)
+    """
+    topology = build_topology(features, config['quantization'])
+    kx, ky = topology['transform']['scale']
+    arcs = [np.asarray(arc, dtype=np.int64) for arc in topology['arcs']]
+
+    levels = []
+    for min_zoom, tolerance_deg in config['levels']:
+        tolerance = tolerance_deg / max(kx, ky)
+        levels.append({
+            'min_zoom': min_zoom,
+            'arcs': [_delta_encode(simplify_arc(arc, tolerance)) for arc in arcs]
+        })
+
+    dept_mesh = [
+        arc_id for arc_id, codes in enumerate(topology['owners'])
+        if len(codes) == 1 or len({code // 1000 for code in codes}) > 1
+    ]
+
+    return {
+        'transform': topology['transform'],
+        'levels': levels,
+        'objects': topology['objects'],
+        'dept_mesh': dept_mesh
+    }
+
+
+# --- Caché ---
+
+def topology_cache_path(filepath: str, content_hash: str, cache_dir: str = CACHE_DIR) -> str:
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(cache_dir, f"{stem}-g{GEOMETRY_FORMAT_VERSION}-{content_hash[:16]}.json")
+
+
+def load_topology(filepath: str = BOUNDARY_FILE) -> dict:
+    """
+    Topología simplificada del archivo de límites, desde la caché si existe
+
+    Returns:
+        Diccionario de simplified_topology, o None si no hay archivo de límites
+    """
+    if not os.path.exists(filepath):
+        return None
+
+    path = topology_cache_path(filepath, file_hash(filepath))
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        pass
+
+    topology = simplified_topology(read_boundaries(filepath))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(topology, fh, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return topology
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_topology(filepath: str, mtime_ns: int) -> dict:
+    return load_topology(filepath)
+
+
+def get_topology(filepath: str = BOUNDARY_FILE) -> dict:
+    """Topología compartida por las sesiones; se recarga si cambia el archivo de límites"""
+    if not os.path.exists(filepath):
+        return None
+    return _cached_topology(filepath, os.stat(filepath).st_mtime_ns)
+
+
+# --- Valores de la coropleta ---
+
+def choropleth_values(df: pd.DataFrame, level: str = 'municipio') -> dict:
+    """
+    Etiqueta y peor alerta por código, para unir con los objetos de la topología
+
+    Args:
+        df: DataFrame filtrado
+        level: 'municipio' (código Divipola) o 'departamento' (código // 1000)
+
+    Returns:
+        {código: [etiqueta, alerta]}
+    """
+    codes = df['Codigo Divipola'].to_numpy(dtype=np.int64)
+    rank = df['Llamada a la acción'].astype(object).map(ALERT_PRIORITY).fillna(len(ALERT_PRIORITY) + 1)
+    table = pd.DataFrame({
+        'code': codes // 1000 if level == 'departamento' else codes,
+        'label': (df['Departamento'] if level == 'departamento' else df['Municipio']).astype(object).to_numpy(),
+        'alert': df['Llamada a la acción'].astype(object).to_numpy(),
+        'rank': rank.to_numpy()
+    })
+    worst = table.sort_values('rank', kind='stable').drop_duplicates('code')
+    return {int(code): [label, alert] for code, label, alert in zip(worst['code'], worst['label'], worst['alert'])}
@@ -0,0 +1,235 @@
+"""
+Historial de boletines de alerta: almacén columnar de solo adición
+
+Cada boletín se guarda como un archivo Parquet con las columnas mínimas
+(código Divipola, departamento, municipio, macrorregión y nivel de alerta
+codificado como entero según ALERT_PRIORITY). Un manifiesto JSON mantiene
+el orden de publicación. Las consultas leen solo las columnas y boletines
+necesarios, sin cargar todo el historial en pandas.
+
+Uso por línea de comandos:
+    python -m utils.history add "N°014-25" data/alerta_014.xlsx --fecha 2025-11-20
+    python -m utils.history list
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import ALERT_PRIORITY, HISTORY_DIR
+
+HISTORY_COLUMNS = ['Codigo Divipola', 'Departamento', 'Municipio', 'Macrorregion']
+ALERT_CODE_COLUMN = 'alerta'
+
+# Códigos de alerta: 1 = Inmediata ... 5 = Ordinaria (menor es más grave)
+ALERT_BY_CODE = {code: alert for alert, code in ALERT_PRIORITY.items()}
+
+_SCHEMA = pa.schema([
+    ('Codigo Divipola', pa.int32()),
+    ('Departamento', pa.dictionary(pa.int16(), pa.string())),
+    ('Municipio', pa.dictionary(pa.int32(), pa.string())),
+    ('Macrorregion', pa.dictionary(pa.int8(), pa.string())),
+    (ALERT_CODE_COLUMN, pa.int8())
+])
+
+
+def bulletin_slug(bulletin_id: str) -> str:
+    """Nombre de archivo seguro para un identificador de boletín"""
+    return re.sub(r'[^0-9A-Za-z_-]+', '', bulletin_id.replace('°', '')).lower()
+
+
+def encode_alerts(alerts: pd.Series) -> np.ndarray:
+    """Niveles de alerta como enteros int8 según ALERT_PRIORITY"""
+    codes = alerts.astype(object).map(ALERT_PRIORITY)
+    if codes.isna().any():
+        unknown = sorted(set(alerts[codes.isna()].astype(str)))
+        raise ValueError(f"Niveles de alerta desconocidos: {unknown}")
+    return codes.to_numpy(dtype=np.int8)
+
+
+class HistoryStore:
+    """
+    Almacén de boletines en disco
+
+    Args:
+        root: Directorio del historial
+    """
+
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+        self._manifest_path = os.path.join(root, 'manifest.json')
+        self._lock = threading.Lock()
+
+    # --- Manifiesto ---
+
+    def bulletins(self) -> list:
+        """Boletines registrados, del más antiguo al más reciente"""
+        if not os.path.exists(self._manifest_path):
+            return []
+        with open(self._manifest_path, encoding='utf-8') as fh:
+            return json.load(fh)['bulletins']
+
+    def bulletin_ids(self) -> list:
+        return [b['id'] for b in self.bulletins()]
+
+    def _write_manifest(self, bulletins: list):
+        tmp_path = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump({'bulletins': bulletins}, fh, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _path(self, bulletin_id: str) -> str:
+        for entry in self.bulletins():
+            if entry['id'] == bulletin_id:
+                return os.path.join(self.root, entry['file'])
+        raise KeyError(f"Boletín no registrado: {bulletin_id}")
+
+    # --- Escritura ---
+
+    def append(self, bulletin_id: str, df: pd.DataFrame, issued: str = None,
+               source_hash: str = None) -> dict:
+        """
+        Agrega un boletín al final del historial
+
+        Raises:
+            ValueError: Si el boletín ya existe (el historial es de solo adición)
+        """
+        with self._lock:
+            bulletins = self.bulletins()
+            if any(b['id'] == bulletin_id for b in bulletins):
+                raise ValueError(f"El boletín {bulletin_id} ya está registrado")
+
+            table = pa.table({
+                'Codigo Divipola': pa.array(df['Codigo Divipola'].to_numpy(dtype=np.int32)),
+                'Departamento': pa.array(df['Departamento'].astype(str)).dictionary_encode(),
+                'Municipio': pa.array(df['Municipio'].astype(str)).dictionary_encode(),
+                'Macrorregion': pa.array(df['Macrorregion'].astype(str)).dictionary_encode(),
+                ALERT_CODE_COLUMN: pa.array(encode_alerts(df['Llamada a la acción']))
+            }).cast(_SCHEMA)
+
+            os.makedirs(self.root, exist_ok=True)
+            file_name = f"{len(bulletins):04d}_{bulletin_slug(bulletin_id)}.parquet"
+            tmp_path = os.path.join(self.root, f".{file_name}.tmp")
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, os.path.join(self.root, file_name))
+
+            entry = {
+                'id': bulletin_id,
+                'file': file_name,
+                'issued': issued or date.today().isoformat(),
+                'rows': table.num_rows,
+                'source_hash': source_hash
+            }
+            self._write_manifest(bulletins + [entry])
+            return entry
+
+    # --- Lectura y consultas ---
+
+    def read(self, bulletin_id: str, columns: list = None) -> pd.DataFrame:
+        """Columnas de un boletín (por defecto todas)"""
+        return pq.read_table(self._path(bulletin_id), columns=columns).to_pandas()
+
+    def escalated_since(self, base_id: str, target_id: str = None) -> pd.DataFrame:
+        """
+        Municipios cuya alerta se agravó entre base_id y target_id (por defecto el último)
+
+        Returns:
+            DataFrame con Codigo Divipola, Departamento, Municipio, alerta
+            anterior, alerta actual y niveles escalados, del mayor salto al menor
+        """
+        target_id = target_id or self.bulletin_ids()[-1]
+        base = self.read(base_id, ['Codigo Divipola', ALERT_CODE_COLUMN])
+        target = self.read(target_id, ['Codigo Divipola', 'Departamento', 'Municipio', ALERT_CODE_COLUMN])
+
+        merged = target.merge(base, on='Codigo Divipola', suffixes=('', '_base'))
+        jump = merged[f'{ALERT_CODE_COLUMN}_base'].astype(int) - merged[ALERT_CODE_COLUMN].astype(int)
+        escalated = merged[jump > 0].assign(Niveles=jump[jump > 0])
+
+        return pd.DataFrame({
+            'Codigo Divipola': escalated['Codigo Divipola'],
+            'Departamento': escalated['Departamento'].astype(str),
+            'Municipio': escalated['Municipio'].astype(str),
+            'Alerta anterior': escalated[f'{ALERT_CODE_COLUMN}_base'].map(ALERT_BY_CODE),
+            'Alerta actual': escalated[ALERT_CODE_COLUMN].map(ALERT_BY_CODE),
+            'Niveles': escalated['Niveles']
+        }).sort_values(['Niveles', 'Departamento', 'Municipio'], ascending=[False, True, True]).reset_index(drop=True)
+
+    def department_trend(self, alerts: list = None, departments: list = None) -> pd.DataFrame:
+        """
+        Serie por boletín del número de municipios por departamento
+
+        Lee un boletín a la vez y solo las columnas de departamento y alerta.
+
+        Args:
+            alerts: Niveles a contar (por defecto todos)
+            departments: Departamentos a incluir (por defecto todos)
+
+        Returns:
+            DataFrame boletín × departamento
+        """
+        codes = [ALERT_PRIORITY[a] for a in alerts] if alerts else None
+        series = {}
+        for bulletin_id in self.bulletin_ids():
+            part = self.read(bulletin_id, ['Departamento', ALERT_CODE_COLUMN])
+            if codes is not None:
+                part = part[part[ALERT_CODE_COLUMN].isin(codes)]
+            counts = part['Departamento'].astype(str).value_counts()
+            if departments:
+                counts = counts.reindex(departments, fill_value=0)
+            series[bulletin_id] = counts
+
+        trend = pd.DataFrame(series).T.fillna(0).astype(int)
+        trend.index.name = 'Boletín'
+        return trend[sorted(trend.columns)] if len(trend.columns) else trend
+
+    def municipality_history(self, codigo: int) -> pd.DataFrame:
+        """Nivel de alerta de un municipio en cada boletín donde aparece"""
+        rows = []
+        for bulletin_id in self.bulletin_ids():
+            part = pq.read_table(
+                self._path(bulletin_id),
+                columns=[ALERT_CODE_COLUMN],
+                filters=[('Codigo Divipola', '=', int(codigo))]
+            )
+            if part.num_rows:
+                rows.append({'Boletín': bulletin_id,
+                             'Alerta': ALERT_BY_CODE[part.column(0)[0].as_py()]})
+        return pd.DataFrame(rows, columns=['Boletín', 'Alerta'])
+
+
+def main(argv=None) -> int:
+    from .data_loader import read_electoral_data
+
+    parser = argparse.ArgumentParser(description="Historial de boletines de alerta")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help='Registrar un boletín a partir de su libro de Excel')
+    add.add_argument('bulletin_id')
+    add.add_argument('filepath')
+    add.add_argument('--fecha', help='Fecha de emisión (AAAA-MM-DD)')
+    sub.add_parser('list', help='Listar boletines registrados')
+
+    args = parser.parse_args(argv)
+    store = HistoryStore()
+
+    if args.command == 'add':
+        df, _ = read_electoral_data(args.filepath)
+        entry = store.append(args.bulletin_id, df, issued=args.fecha,
+                             source_hash=df.attrs.get('data_version'))
+        print(f"Registrado {entry['id']}: {entry['rows']} municipios ({entry['file']})")
+    else:
+        for entry in store.bulletins():
+            print(f"{entry['id']:<12} {entry['issued']}  {entry['rows']:>7} municipios")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""
+Detección de focos (hotspots) de alertas críticas con Getis-Ord Gi*
+
+Cada municipio recibe un z-score que compara la proporción de alertas
+críticas en su vecindario (municipios a menos de band_km, incluido él
+mismo) con la del conjunto analizado. Los municipios con z alto y
+significativo se agrupan en focos contiguos.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .config import CRITICAL_ALERTS, HOTSPOT_CONFIG
+from .spatial import SpatialIndex
+
+# z críticos (una cola) por nivel de confianza
+CONFIDENCE_LEVELS = ((0.999, 3.09), (0.99, 2.33), (0.95, 1.645), (0.90, 1.28))
+
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+
+def gi_star(index: SpatialIndex, values: np.ndarray, band_km: float) -> np.ndarray:
+    """
+    Estadístico Gi* (z-score) de cada punto con pesos binarios por distancia
+
+    Args:
+        index: Índice espacial de los puntos
+        values: Valor 0/1 por punto (1 = alerta crítica)
+        band_km: Radio del vecindario
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    if n < 3:
+        return np.zeros(n)
+    mean = x.mean()
+    std = np.sqrt((x ** 2).mean() - mean ** 2)
+    if std == 0:
+        return np.zeros(n)
+
+    # Con pesos binarios sum(w) = sum(w^2) = vecinos + el propio punto
+    weights = index.neighbor_counts(band_km) + 1.0
+    local = index.neighbor_counts(band_km, mask=x > 0) + x
+    denominator = std * np.sqrt((n * weights - weights ** 2) / (n - 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (local - mean * weights) / denominator
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def p_values(z: np.ndarray) -> np.ndarray:
+    """p-valor de una cola (foco caliente) para cada z"""
+    return (0.5 * _erfc(np.asarray(z, dtype=np.float64) / math.sqrt(2))).astype(np.float64)
+
+
+def significant(p: np.ndarray, alpha: float, fdr: bool = True) -> np.ndarray:
+    """Máscara de significancia, con corrección de Benjamini-Hochberg si fdr"""
+    if not fdr or len(p) == 0:
+        return p <= alpha
+    order = np.argsort(p)
+    thresholds = alpha * np.arange(1, len(p) + 1) / len(p)
+    passed = np.flatnonzero(p[order] <= thresholds)
+    mask = np.zeros(len(p), dtype=bool)
+    if len(passed):
+        mask[order[:passed[-1] + 1]] = True
+    return mask
+
+
+def confidence_label(z: np.ndarray) -> np.ndarray:
+    """Nivel de confianza alcanzado por cada z ('' si ninguno)"""
+    labels = np.full(len(z), '', dtype=object)
+    for confidence, threshold in reversed(CONFIDENCE_LEVELS):
+        labels[z >= threshold] = f'{confidence:.1%}'
+    return labels
+
+
+def cluster_hotspots(index: SpatialIndex, hot: np.ndarray, band_km: float) -> np.ndarray:
+    """
+    Agrupa los puntos calientes a menos de band_km entre sí (componentes conexas)
+
+    Returns:
+        Id de foco por punto (-1 para los que no son calientes)
+    """
+    parent = {i: i for i in np.flatnonzero(hot).tolist()}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in parent:
+        neighbors, _ = index.radius(index.lat[i], index.lon[i], band_km)
+        for j in neighbors[hot[neighbors]].tolist():
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    labels = np.full(len(hot), -1, dtype=np.int64)
+    roots = {}
+    for i in parent:
+        labels[i] = roots.setdefault(find(i), len(roots))
+    return labels
+
+
+def analyze_hotspots(df: pd.DataFrame, band_km: float = HOTSPOT_CONFIG['band_km'],
+                     alpha: float = HOTSPOT_CONFIG['alpha'], fdr: bool = HOTSPOT_CONFIG['fdr']) -> tuple:
+    """
+    Focos de alertas críticas en df
+
+    Returns:
+        Tupla (municipios, focos):
+        - municipios: filas calientes de df con columnas z, p, Confianza y Foco
+        - focos: un registro por foco, ordenado por z máximo y tamaño
+    """
+    index = SpatialIndex.from_frame(df)
+    critical = df['Llamada a la acción'].isin(CRITICAL_ALERTS).to_numpy()
+    z = gi_star(index, critical, band_km)
+    p = p_values(z)
+    hot = (z > 0) & significant(p, alpha, fdr)
+    labels = cluster_hotspots(index, hot, band_km)
+
+    points = df[['Municipio', 'Departamento', 'Macrorregion', 'Llamada a la acción',
+                 'Codigo Divipola', 'Latitud', 'Longitud']].iloc[np.flatnonzero(hot)].assign(
+        z=z[hot].round(2),
+        p=p[hot],
+        Confianza=confidence_label(z[hot]),
+        Foco=labels[hot] + 1
+    )
+
+    columns = ['Foco', 'Municipios', 'Alertas críticas', 'z máximo', 'Departamentos', 'Latitud', 'Longitud']
+    if points.empty:
+        return points, pd.DataFrame(columns=columns)
+
+    groups = points.assign(critica=points['Llamada a la acción'].isin(CRITICAL_ALERTS)).groupby('Foco')
+    clusters = pd.DataFrame({
+        'Municipios': groups.size(),
+        'Alertas críticas': groups['critica'].sum(),
+        'z máximo': groups['z'].max(),
+        'Departamentos': groups['Departamento'].agg(lambda s: ', '.join(sorted(s.astype(str).unique()))),
+        'Latitud': groups['Latitud'].mean().astype(float).round(4),
+        'Longitud': groups['Longitud'].mean().astype(float).round(4)
+    }).reset_index()
+    clusters = clusters.sort_values(['z máximo', 'Municipios'], ascending=False, ignore_index=True)
+
+    # Focos renumerados por rango
+    ranks = dict(zip(clusters['Foco'], range(1, len(clusters) + 1)))
+    clusters['Foco'] = clusters['Foco'].map(ranks)
+    points = points.assign(Foco=points['Foco'].map(ranks)).sort_values(['Foco', 'z'], ascending=[True, False])
+    return points, clusters[columns]
@@ -0,0 +1,92 @@
+"""Medición de tiempos por etapa de cada ejecución del dashboard"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('alerta_electoral.profiling')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Streamlit ejecuta cada rerun en su propio hilo
+_local = threading.local()
+
+
+class RerunProfiler:
+    """
+    Acumula duraciones de etapas y métricas sueltas de un rerun
+
+    Las etapas pueden anidarse; su nombre completo une los niveles con '/'.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.metrics = {}
+        self.finished = False
+        self._path = []
+
+    @contextmanager
+    def stage(self, name: str):
+        self._path.append(name)
+        full_name = '/'.join(self._path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((full_name, time.perf_counter() - start))
+            self._path.pop()
+
+    def metric(self, name: str, value):
+        self.metrics[name] = value
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        return {
+            'total_ms': round(self.total_seconds * 1000, 2),
+            'stages_ms': {name: round(seconds * 1000, 2) for name, seconds in self.stages},
+            'metrics': self.metrics
+        }
+
+    def log(self):
+        """Emite el resumen del rerun como una línea JSON (y lo da por terminado)"""
+        self.finished = True
+        logger.info(json.dumps(self.as_dict(), ensure_ascii=False, default=str))
+
+
+def start_rerun() -> RerunProfiler:
+    """Inicia la medición del rerun actual (hilo actual)"""
+    _local.profiler = RerunProfiler()
+    return _local.profiler
+
+
+def current_profiler():
+    """Perfilador del rerun en curso, o None fuera de un rerun medido"""
+    return getattr(_local, 'profiler', None)
+
+
+@contextmanager
+def stage(name: str):
+    """Mide una etapa en el rerun en curso (sin efecto si no hay medición activa)"""
+    profiler = current_profiler()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def record_metric(name: str, value):
+    """Registra una métrica en el rerun en curso"""
+    profiler = current_profiler()
+    if profiler is not None:
+        profiler.metric(name, value)
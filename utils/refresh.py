@@ -0,0 +1,260 @@
+"""Actualización incremental del dataset ante cambios del archivo de origen"""
+
+import functools
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .aggregates import AlertCube, get_alert_cube
+from .cache import file_hash
+from .config import DATA_FILE, REFRESH_CHECK_SECONDS, SHARED_DATA_DIR
+from .data_loader import alert_dtype, get_filter_index, read_electoral_data, register_derived
+from .filter_index import FilterIndex
+from .search import PlaceIndex
+from .shared import attach, current_version, publish_from_file
+from .spatial import SpatialIndex
+
+KEY_COLUMN = 'Codigo Divipola'
+
+
+def diff_by_code(old: pd.DataFrame, new: pd.DataFrame, key: str = KEY_COLUMN):
+    """
+    Compara dos versiones del dataset fila a fila por código Divipola
+
+    Returns:
+        Diccionario con arreglos de códigos 'added', 'removed' y 'changed',
+        o None si no se puede comparar (códigos duplicados o columnas distintas)
+    """
+    if list(old.columns) != list(new.columns):
+        return None
+    if old[key].duplicated().any() or new[key].duplicated().any():
+        return None
+
+    old_by_code = old.set_index(key)
+    new_by_code = new.set_index(key)
+
+    common = old_by_code.index.intersection(new_by_code.index)
+    left = old_by_code.loc[common]
+    right = new_by_code.loc[common, left.columns]
+    same = (left.to_numpy() == right.to_numpy()) | (left.isna().to_numpy() & right.isna().to_numpy())
+
+    return {
+        'added': new_by_code.index.difference(old_by_code.index).to_numpy(),
+        'removed': old_by_code.index.difference(new_by_code.index).to_numpy(),
+        'changed': common[~same.all(axis=1)].to_numpy()
+    }
+
+
+def merged_categories(dtype: pd.CategoricalDtype, values: pd.Series) -> pd.CategoricalDtype:
+    """Tipo categórico que incluye además los valores nuevos de values"""
+    new_values = set(values.dropna().unique()) - set(dtype.categories)
+    if not new_values:
+        return dtype
+    if dtype.ordered:
+        return alert_dtype(list(dtype.categories) + list(new_values))
+    return pd.CategoricalDtype(sorted(set(dtype.categories) | new_values))
+
+
+class DatasetStore:
+    """
+    Dataset en memoria compartido por todas las sesiones
+
+    refresh() detecta cambios del archivo (mtime y luego hash), compara las
+    filas por código Divipola y aplica solo los municipios modificados o
+    nuevos al DataFrame y a sus estructuras derivadas (índice de filtros y
+    cubo de conteos). Cada actualización publica una nueva versión de
+    datos, con la que se indexan las cachés posteriores.
+
+    Las versiones publicadas nunca se modifican: cada cambio produce un
+    DataFrame nuevo, de modo que las sesiones a mitad de un rerun siguen
+    viendo datos consistentes.
+
+    Con shared_dir (ALERTA_SHARED_DIR) el dataset y su índice no se cargan
+    en el proceso: se mapean en memoria desde la versión publicada en ese
+    directorio (ver utils.shared), compartida por todos los procesos.
+    """
+
+    def __init__(self, filepath: str = DATA_FILE, check_interval: float = REFRESH_CHECK_SECONDS,
+                 shared_dir: str = SHARED_DATA_DIR):
+        self.filepath = filepath
+        self.check_interval = check_interval
+        self.shared_dir = shared_dir
+        self.df = None
+        self.dropped = 0
+        self.content_hash = None
+        self.last_change = None
+        self._mtime = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return self.df.attrs.get('data_version', '') if self.df is not None else ''
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Comprueba el archivo y aplica los cambios
+
+        Returns:
+            True si se publicó una nueva versión de datos
+        """
+        now = time.monotonic()
+        if not force and self.df is not None and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            if self.shared_dir:
+                return self._refresh_shared()
+
+            mtime = os.stat(self.filepath).st_mtime_ns
+            if self.df is not None and mtime == self._mtime:
+                return False
+
+            content_hash = file_hash(self.filepath)
+            self._mtime = mtime
+            if content_hash == self.content_hash:
+                return False
+
+            new_df, dropped = read_electoral_data(self.filepath, content_hash)
+            if self.df is None:
+                self.last_change = None
+                self._publish(new_df)
+            else:
+                self._apply(new_df)
+
+            self.content_hash = content_hash
+            self.dropped = dropped
+            return True
+
+    def _refresh_shared(self) -> bool:
+        """Adjunta la versión publicada vigente (y la publica si el libro cambió)"""
+        if os.path.exists(self.filepath):
+            mtime = os.stat(self.filepath).st_mtime_ns
+            if mtime != self._mtime:
+                # Sin publicador dedicado, cualquier réplica puede publicar:
+                # el contenido es determinista y la escritura atómica
+                publish_from_file(self.filepath, self.shared_dir)
+                self._mtime = mtime
+
+        version = current_version(self.shared_dir)
+        if version is None:
+            raise FileNotFoundError(f"No hay datos publicados en {self.shared_dir}")
+        if version == self.version:
+            return False
+
+        df, filter_index, dropped = attach(self.shared_dir, version)
+        self.last_change = {'mode': 'shared'} if self.df is not None else None
+        self._publish(df, filter_index)
+        self.content_hash = None
+        self.dropped = dropped
+        return True
+
+    def _publish(self, df: pd.DataFrame, filter_index=None, alert_cube=None):
+        """
+        Registra las estructuras derivadas de df y lo publica
+
+        Todas se construyen al cargar (son baratas): así la API, que corre
+        fuera de Streamlit, nunca recurre a las cachés de st.cache_resource.
+        """
+        version = df.attrs['data_version']
+        register_derived(version, 'spatial_index', SpatialIndex.from_frame(df))
+        register_derived(version, 'place_index', PlaceIndex(df))
+        register_derived(version, 'filter_index', filter_index if filter_index is not None else FilterIndex(df))
+        register_derived(version, 'alert_cube', alert_cube if alert_cube is not None else AlertCube.from_frame(df))
+        self.df = df
+
+    def _apply(self, new_df: pd.DataFrame):
+        """Aplica new_df sobre la versión actual, de forma incremental si es posible"""
+        old = self.df
+        diff = diff_by_code(old, new_df)
+
+        # Bajas o cambios de esquema: reconstrucción completa
+        if diff is None or len(diff['removed']) > 0:
+            self.last_change = {'mode': 'full', **self._summary(diff)}
+            self._publish(new_df)
+            return
+
+        self.last_change = {'mode': 'incremental', **self._summary(diff)}
+        if len(diff['changed']) == 0 and len(diff['added']) == 0:
+            # Mismos datos (p. ej. solo cambió el formato del libro)
+            next_df = old.copy(deep=False)
+            next_df.attrs = dict(old.attrs, data_version=new_df.attrs['data_version'])
+            self._publish(next_df, get_filter_index(old), get_alert_cube(old))
+            return
+
+        old_positions = pd.Series(np.arange(len(old)), index=old[KEY_COLUMN])
+        new_by_code = new_df.set_index(KEY_COLUMN, drop=False)
+        changed_pos = old_positions.loc[diff['changed']].to_numpy()
+
+        # Copia con las filas modificadas en sus mismas posiciones y altas al final
+        next_df = old.copy()
+        incoming = new_by_code.loc[np.concatenate([diff['changed'], diff['added']]), old.columns]
+        for col in old.columns:
+            if isinstance(next_df[col].dtype, pd.CategoricalDtype):
+                next_df[col] = next_df[col].astype(merged_categories(next_df[col].dtype, incoming[col]))
+        incoming = incoming.astype(next_df.dtypes.to_dict())
+
+        changed_rows = incoming.iloc[:len(changed_pos)]
+        for col in old.columns:
+            next_df.iloc[changed_pos, next_df.columns.get_loc(col)] = changed_rows[col].to_numpy()
+        if len(diff['added']) > 0:
+            next_df = pd.concat([next_df, incoming.iloc[len(changed_pos):]], ignore_index=True)
+        next_df.attrs = dict(old.attrs, data_version=new_df.attrs['data_version'])
+
+        touched = np.concatenate([changed_pos, np.arange(len(old), len(next_df))])
+        filter_index = get_filter_index(old).with_changes(next_df, touched)
+        alert_cube = get_alert_cube(old).with_delta(old.iloc[changed_pos], next_df.iloc[touched])
+        if alert_cube is None:
+            alert_cube = AlertCube.from_frame(next_df)
+
+        self._publish(next_df, filter_index, alert_cube)
+
+    @staticmethod
+    def _summary(diff) -> dict:
+        if diff is None:
+            return {'added': None, 'removed': None, 'changed': None}
+        return {name: len(codes) for name, codes in diff.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _dataset_store(filepath: str) -> DatasetStore:
+    return DatasetStore(filepath)
+
+
+def get_dataset_store(filepath: str = DATA_FILE) -> DatasetStore:
+    """
+    Almacén compartido del dataset para un archivo de origen
+
+    Caché de módulo y no st.cache_resource: el mismo almacén sirve al
+    dashboard y a la API, que no tiene runtime de Streamlit.
+    """
+    return _dataset_store(filepath)
+
+
+def get_electoral_data(filepath: str = DATA_FILE) -> pd.DataFrame:
+    """
+    Dataset vigente, comprobando antes si el archivo de origen cambió
+
+    Si una actualización falla se sigue sirviendo la última versión válida.
+    El DataFrame devuelto es compartido: no debe modificarse.
+    """
+    store = get_dataset_store(filepath)
+    try:
+        store.refresh()
+    except FileNotFoundError:
+        st.error(f"❌ Archivo no encontrado: {filepath}")
+    except Exception as e:
+        st.error(f"❌ Error al cargar datos: {str(e)}")
+
+    if store.df is None:
+        return pd.DataFrame()
+
+    if store.dropped > 0:
+        st.warning(f"⚠️ Se excluyeron {store.dropped} municipios sin coordenadas válidas")
+
+    return store.df
@@ -0,0 +1,131 @@
+"""Búsqueda aproximada de municipios y departamentos (trigramas sin tildes)"""
+
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .data_loader import get_data_version, lookup_derived
+
+
+def fold(text: str) -> str:
+    """Minúsculas sin tildes ni signos: 'Bogotá, D.C.' -> 'bogota d c'"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    plain = ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return ' '.join(''.join(ch if ch.isalnum() else ' ' for ch in plain).split())
+
+
+def trigrams(folded: str) -> set:
+    """Trigramas de cada palabra, con relleno para favorecer los comienzos"""
+    grams = set()
+    for word in folded.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(frozen=True)
+class PlaceMatch:
+    """Resultado de búsqueda: un municipio o un departamento"""
+    kind: str
+    name: str
+    department: str
+    score: float
+    position: int = -1
+
+    @property
+    def label(self) -> str:
+        if self.kind == 'municipio':
+            return f'{self.name} ({self.department})'
+        return f'{self.name} (departamento)'
+
+
+class PlaceIndex:
+    """
+    Índice invertido de trigramas sobre nombres de municipios y departamentos
+
+    Los nombres se comparan sin tildes ni mayúsculas. La similitud es el
+    índice de Jaccard entre trigramas (tolera errores de digitación), con
+    bonificación para coincidencias exactas y prefijos de palabra.
+
+    Args:
+        df: DataFrame con Municipio y Departamento (índice posicional)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        municipios = df['Municipio'].astype(str).to_numpy()
+        departamentos = df['Departamento'].astype(str).to_numpy()
+        unique_depts = sorted(set(departamentos))
+
+        self.kinds = np.array(['municipio'] * len(municipios) + ['departamento'] * len(unique_depts))
+        self.names = list(municipios) + unique_depts
+        self.departments = list(departamentos) + unique_depts
+        self.positions = np.r_[np.arange(len(municipios)), np.full(len(unique_depts), -1)]
+        self.folded = [fold(name) for name in self.names]
+
+        postings = {}
+        sizes = np.empty(len(self.names), dtype=np.float64)
+        for entry, folded in enumerate(self.folded):
+            grams = trigrams(folded)
+            sizes[entry] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.sizes = sizes
+
+    def search(self, query: str, limit: int = 10, kind: str = None,
+               min_score: float = 0.25, candidates: int = 200) -> list:
+        """
+        Entradas más parecidas a query, de mayor a menor similitud
+
+        Args:
+            kind: 'municipio' o 'departamento' para restringir el resultado
+            candidates: Entradas con más trigramas en común que se puntúan
+        """
+        folded = fold(query)
+        grams = trigrams(folded)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return []
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+        if kind is not None:
+            shared[self.kinds != kind] = 0
+        top = np.flatnonzero(shared)
+        if len(top) > candidates:
+            top = top[np.argpartition(shared[top], -candidates)[-candidates:]]
+
+        scores = shared[top] / (len(grams) + self.sizes[top] - shared[top])
+        for i, entry in enumerate(top.tolist()):
+            name = self.folded[entry]
+            if name == folded:
+                scores[i] += 1.0
+            elif name.startswith(folded) or f' {folded}' in f' {name}':
+                scores[i] += 0.5
+
+        keep = scores >= min_score
+        top, scores = top[keep], scores[keep]
+        order = np.lexsort((top, -scores))[:limit]
+        return [
+            PlaceMatch(str(self.kinds[e]), self.names[e], self.departments[e], round(float(scores[i]), 3),
+                       int(self.positions[e]))
+            for i, e in ((i, int(top[i])) for i in order)
+        ]
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_place_index(_df: pd.DataFrame, data_version: str) -> PlaceIndex:
+    return PlaceIndex(_df)
+
+
+def get_place_index(df: pd.DataFrame) -> PlaceIndex:
+    """Índice de búsqueda del dataset, construido una vez por versión de datos"""
+    data_version = get_data_version(df)
+    if not data_version:
+        return PlaceIndex(df)
+    registered = lookup_derived(data_version, 'place_index')
+    if registered is not None:
+        return registered
+    return _cached_place_index(df, data_version)
@@ -0,0 +1,178 @@
+"""
+Dataset compartido entre procesos y réplicas mediante archivos mapeados en memoria
+
+Un proceso publicador escribe, por cada versión de datos, las columnas
+limpias en un archivo Arrow IPC sin compresión y los bitmaps del índice de
+filtros en una matriz .npy. Los procesos del dashboard los abren con mmap en
+modo solo lectura, de modo que todas las sesiones y réplicas de la máquina
+(o del volumen compartido) usan las mismas páginas de memoria.
+
+Uso:
+    python -m utils.shared publish             # publica una vez
+    python -m utils.shared publish --watch 30  # republica al cambiar el libro
+
+Los procesos del dashboard lo usan al definir ALERTA_SHARED_DIR.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .cache import file_hash
+from .config import DATA_FILE, SHARED_DATA_DIR
+from .filter_index import FilterIndex
+
+POINTER_FILE = 'CURRENT'
+VERSIONS_KEPT = 2
+
+
+def _paths(root: str, version: str) -> dict:
+    return {
+        'table': os.path.join(root, f'{version}.arrow'),
+        'bitmaps': os.path.join(root, f'{version}.bitmaps.npy'),
+        'manifest': os.path.join(root, f'{version}.json')
+    }
+
+
+def _atomic_write(path: str, write, mode: str = 'wb'):
+    """Escribe con write(fh) en un temporal y lo mueve a path"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as fh:
+        write(fh)
+    os.replace(tmp_path, path)
+
+
+def publish(df: pd.DataFrame, filter_index: FilterIndex, root: str = SHARED_DATA_DIR,
+            dropped: int = 0) -> str:
+    """
+    Publica una versión del dataset y su índice; devuelve la versión
+
+    Los archivos se escriben completos antes de mover el puntero CURRENT,
+    así que los lectores nunca ven una versión a medias. Publicar dos veces
+    la misma versión es inocuo.
+    """
+    version = df.attrs['data_version']
+    paths = _paths(root, version)
+    os.makedirs(root, exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    def write_table(fh):
+        with pa.ipc.new_file(fh, table.schema) as writer:
+            writer.write_table(table)
+
+    # Todos los bitmaps tienen el mismo largo: una fila de la matriz por valor
+    keys = [(col, value) for col, bitmaps in filter_index.bitmaps.items() for value in bitmaps]
+    matrix = (np.stack([filter_index.bitmaps[col][value] for col, value in keys])
+              if keys else np.zeros((0, (len(df) + 7) // 8), dtype=np.uint8))
+
+    manifest = {
+        'version': version,
+        'rows': len(df),
+        'dropped': dropped,
+        'index_keys': [[col, value] for col, value in keys]
+    }
+
+    _atomic_write(paths['table'], write_table)
+    _atomic_write(paths['bitmaps'], lambda fh: np.save(fh, matrix))
+    _atomic_write(paths['manifest'], lambda fh: json.dump(manifest, fh, ensure_ascii=False), mode='w')
+    _atomic_write(os.path.join(root, POINTER_FILE), lambda fh: fh.write(version), mode='w')
+
+    _prune(root, keep=VERSIONS_KEPT)
+    return version
+
+
+def _prune(root: str, keep: int):
+    """Elimina versiones antiguas (los procesos que aún las mapean no se ven afectados en POSIX)"""
+    manifests = sorted(
+        (os.path.join(root, name) for name in os.listdir(root) if name.endswith('.json')),
+        key=os.path.getmtime
+    )
+    for manifest in manifests[:-keep]:
+        version = os.path.basename(manifest)[:-len('.json')]
+        for path in _paths(root, version).values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def current_version(root: str = SHARED_DATA_DIR):
+    """Versión publicada vigente, o None si no hay ninguna"""
+    try:
+        with open(os.path.join(root, POINTER_FILE)) as fh:
+            return fh.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach(root: str = SHARED_DATA_DIR, version: str = None) -> tuple:
+    """
+    Abre una versión publicada sin copiarla
+
+    Returns:
+        Tupla (DataFrame de solo lectura, FilterIndex, registros excluidos)
+    """
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f"No hay datos publicados en {root}")
+    paths = _paths(root, version)
+
+    with open(paths['manifest'], encoding='utf-8') as fh:
+        manifest = json.load(fh)
+
+    # Columnas: Arrow IPC mapeado; las columnas numéricas se convierten sin copia
+    source = pa.memory_map(paths['table'], 'r')
+    table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas(split_blocks=True, self_destruct=False)
+    df.attrs['data_version'] = version
+
+    # Índice: cada bitmap es una vista de la matriz mapeada
+    matrix = np.load(paths['bitmaps'], mmap_mode='r')
+    bitmaps = {}
+    for row, (col, value) in enumerate(manifest['index_keys']):
+        bitmaps.setdefault(col, {})[value] = matrix[row]
+    filter_index = FilterIndex.from_bitmaps(manifest['rows'], bitmaps)
+
+    return df, filter_index, manifest.get('dropped', 0)
+
+
+def publish_from_file(filepath: str = DATA_FILE, root: str = SHARED_DATA_DIR) -> str:
+    """Lee el libro (vía caché Parquet) y publica su versión si aún no existe"""
+    from .data_loader import read_electoral_data
+
+    content_hash = file_hash(filepath)
+    if current_version(root) == content_hash[:16]:
+        return content_hash[:16]
+    df, dropped = read_electoral_data(filepath, content_hash)
+    return publish(df, FilterIndex(df), root, dropped=dropped)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Publicación del dataset compartido")
+    sub = parser.add_subparsers(dest='command', required=True)
+    pub = sub.add_parser('publish', help='Publicar la versión vigente del libro')
+    pub.add_argument('--data', default=DATA_FILE, help='Libro de Excel de origen')
+    pub.add_argument('--dir', default=SHARED_DATA_DIR, help='Directorio compartido')
+    pub.add_argument('--watch', type=float, metavar='SEGUNDOS',
+                     help='Seguir vigilando el libro y republicar al cambiar')
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error('Indique --dir o defina ALERTA_SHARED_DIR')
+
+    while True:
+        version = publish_from_file(args.data, args.dir)
+        print(f"Versión publicada: {version}", flush=True)
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
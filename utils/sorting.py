@@ -0,0 +1,96 @@
+"""Órdenes precalculados del dataset para servir la tabla detallada por páginas"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .config import ALERT_PRIORITY, TABLE_CONFIG
+from .data_loader import get_data_version
+
+# Desempate común a todos los órdenes
+TIEBREAK_COLUMNS = ('Departamento', 'Municipio')
+
+
+def _value_ranks(values: pd.Index, column: str) -> np.ndarray:
+    """Rango de cada valor distinto; el nivel de alerta se ordena por ALERT_PRIORITY"""
+    if column == 'Llamada a la acción':
+        return values.astype(str).map(lambda v: ALERT_PRIORITY.get(v, len(ALERT_PRIORITY) + 1)).to_numpy(dtype=np.int64)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str)
+    return pd.factorize(values, sort=True)[0].astype(np.int64)
+
+
+def sort_ranks(series: pd.Series) -> np.ndarray:
+    """Rango entero de cada fila según su valor en series (faltantes primero)"""
+    # Se ordenan los valores distintos y no las filas; las categóricas por
+    # su texto, no por el orden de sus categorías
+    codes, uniques = pd.factorize(series)
+    ranks = _value_ranks(pd.Index(uniques), series.name)
+    # El código -1 (faltante) toma el último elemento: rango -1
+    return np.append(ranks, -1)[codes]
+
+
+class SortIndex:
+    """
+    Permutaciones del dataset completo por columna y sentido
+
+    Cada permutación se calcula la primera vez que se pide y se reutiliza
+    para cualquier combinación de filtros: las filas filtradas se obtienen
+    recorriendo la permutación con una máscara, sin volver a ordenar.
+
+    Args:
+        df: Dataset completo
+        columns: Columnas ordenables
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list = TABLE_CONFIG['columns']):
+        self.n_rows = len(df)
+        self.ranks = {col: sort_ranks(df[col]) for col in set(columns) | set(TIEBREAK_COLUMNS)}
+        self._orders = {}
+
+    def order(self, column: str, descending: bool = False) -> np.ndarray:
+        """Posiciones de todas las filas ordenadas por column (desempate estable)"""
+        key = (column, descending)
+        if key not in self._orders:
+            primary = -self.ranks[column] if descending else self.ranks[column]
+            tiebreak = [self.ranks[col] for col in reversed(TIEBREAK_COLUMNS)]
+            self._orders[key] = np.lexsort(tiebreak + [primary])
+        return self._orders[key]
+
+    def page(self, column: str, descending: bool, positions: np.ndarray = None,
+             page: int = 1, page_size: int = TABLE_CONFIG['page_size']) -> tuple:
+        """
+        Una página de filas ordenadas
+
+        Args:
+            positions: Filas seleccionadas (filter_positions); None = todas
+            page: Número de página desde 1
+
+        Returns:
+            Tupla (posiciones de la página, total de filas seleccionadas)
+        """
+        rows = self.order(column, descending)
+        if positions is not None:
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[positions] = True
+            rows = rows[selected[rows]]
+        start = (page - 1) * page_size
+        return rows[start:start + page_size], len(rows)
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_sort_index(_df: pd.DataFrame, data_version: str) -> SortIndex:
+    return SortIndex(_df)
+
+
+def get_sort_index(df: pd.DataFrame) -> SortIndex:
+    """
+    Índice de orden del dataset, construido una vez por versión de datos
+
+    No se registra al cargar (a diferencia del índice espacial): se
+    construye la primera vez que alguien abre la tabla.
+    """
+    data_version = get_data_version(df)
+    if not data_version:
+        return SortIndex(df)
+    return _cached_sort_index(df, data_version)
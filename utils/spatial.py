@@ -0,0 +1,165 @@
+"""Índice espacial en rejilla para consultas por radio, rectángulo y vecindad"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .config import SPATIAL_CONFIG
+from .data_loader import get_data_version, lookup_derived
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Distancia de gran círculo en km (admite arreglos)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _lon_span(radius_km: float, lat: float) -> float:
+    """Grados de longitud que cubren radius_km a la latitud dada"""
+    return radius_km / (KM_PER_DEGREE * max(np.cos(np.radians(min(abs(lat), 89.0))), 0.01))
+
+
+class SpatialIndex:
+    """
+    Rejilla uniforme de celdas de cell_deg grados sobre Latitud/Longitud
+
+    Las posiciones de fila se guardan ordenadas por celda (fila mayor), con
+    el inicio de cada celda en offsets: las celdas de una misma fila de la
+    rejilla son contiguas, así que un rectángulo se resuelve con un corte
+    por fila y solo se miden distancias a esos candidatos.
+
+    Args:
+        lat, lon: Coordenadas por posición de fila
+        cell_deg: Lado de la celda en grados
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_deg: float = SPATIAL_CONFIG['cell_deg']):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_deg
+
+        valid = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+        if len(valid) == 0:
+            self.lat0 = self.lon0 = 0.0
+            self.n_rows = self.n_cols = 1
+            self.order = valid
+            self.offsets = np.zeros(2, dtype=np.int64)
+            return
+
+        self.lat0 = self.lat[valid].min()
+        self.lon0 = self.lon[valid].min()
+        rows = ((self.lat[valid] - self.lat0) // cell_deg).astype(np.int64)
+        cols = ((self.lon[valid] - self.lon0) // cell_deg).astype(np.int64)
+        self.n_rows = int(rows.max()) + 1
+        self.n_cols = int(cols.max()) + 1
+
+        cells = rows * self.n_cols + cols
+        order = np.argsort(cells, kind='stable')
+        self.order = valid[order]
+        self.offsets = np.searchsorted(cells[order], np.arange(self.n_rows * self.n_cols + 1))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cell_deg: float = SPATIAL_CONFIG['cell_deg']) -> 'SpatialIndex':
+        return cls(df['Latitud'].to_numpy(), df['Longitud'].to_numpy(), cell_deg)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _candidates(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Posiciones en las celdas que tocan el rectángulo (superconjunto)"""
+        r0 = max(int((south - self.lat0) // self.cell_deg), 0)
+        r1 = min(int((north - self.lat0) // self.cell_deg), self.n_rows - 1)
+        c0 = max(int((west - self.lon0) // self.cell_deg), 0)
+        c1 = min(int((east - self.lon0) // self.cell_deg), self.n_cols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        starts = self.offsets[np.arange(r0, r1 + 1) * self.n_cols + c0]
+        ends = self.offsets[np.arange(r0, r1 + 1) * self.n_cols + c1 + 1]
+        if len(starts) == 1:
+            return self.order[starts[0]:ends[0]]
+        return np.concatenate([self.order[s:e] for s, e in zip(starts, ends)])
+
+    def bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Posiciones (ordenadas) de los puntos dentro del rectángulo"""
+        candidates = self._candidates(south, west, north, east)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(candidates[inside])
+
+    def radius(self, lat: float, lon: float, radius_km: float) -> tuple:
+        """
+        Puntos a menos de radius_km del punto dado
+
+        Returns:
+            Tupla (posiciones, distancias en km), de la más cercana a la más lejana
+        """
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = _lon_span(radius_km, abs(lat) + dlat)
+        candidates = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        dist = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = dist <= radius_km
+        order = np.argsort(dist[inside], kind='stable')
+        return candidates[inside][order], dist[inside][order]
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> tuple:
+        """Los k puntos más cercanos (ampliando el radio de búsqueda hasta encontrarlos)"""
+        k = min(k, len(self.order))
+        radius_km = self.cell_deg * KM_PER_DEGREE
+        while True:
+            positions, dist = self.radius(lat, lon, radius_km)
+            if len(positions) >= k or radius_km > 2 * np.pi * EARTH_RADIUS_KM:
+                return positions[:k], dist[:k]
+            radius_km *= 2
+
+    def neighbor_counts(self, radius_km: float, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Para cada punto, cuántos otros puntos (de los marcados en mask) hay a menos de radius_km
+
+        Se calcula celda por celda contra los candidatos de su vecindario, sin
+        comparar todos los pares.
+        """
+        counts = np.zeros(len(self), dtype=np.int64)
+        targets = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        dlat = radius_km / KM_PER_DEGREE
+
+        for cell in np.flatnonzero(np.diff(self.offsets)):
+            members = self.order[self.offsets[cell]:self.offsets[cell + 1]]
+            row, col = divmod(int(cell), self.n_cols)
+            south = self.lat0 + row * self.cell_deg
+            west = self.lon0 + col * self.cell_deg
+            north, east = south + self.cell_deg, west + self.cell_deg
+            dlon = _lon_span(radius_km, max(abs(south), abs(north)) + dlat)
+
+            candidates = self._candidates(south - dlat, west - dlon, north + dlat, east + dlon)
+            candidates = candidates[targets[candidates]]
+            if len(candidates) == 0:
+                continue
+            dist = haversine_km(self.lat[members][:, None], self.lon[members][:, None],
+                                self.lat[candidates][None, :], self.lon[candidates][None, :])
+            within = dist <= radius_km
+            # Un punto no es vecino de sí mismo
+            within &= members[:, None] != candidates[None, :]
+            counts[members] = within.sum(axis=1)
+        return counts
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_spatial_index(_df: pd.DataFrame, data_version: str) -> SpatialIndex:
+    return SpatialIndex.from_frame(_df)
+
+
+def get_spatial_index(df: pd.DataFrame) -> SpatialIndex:
+    """Índice espacial del dataset, construido una vez por versión de datos"""
+    data_version = get_data_version(df)
+    if not data_version:
+        return SpatialIndex.from_frame(df)
+    registered = lookup_derived(data_version, 'spatial_index')
+    if registered is not None:
+        return registered
+    return _cached_spatial_index(df, data_version)
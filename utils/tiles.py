@@ -0,0 +1,351 @@
+"""
+Teselas vectoriales (Mapbox Vector Tile) de los municipios con alerta
+
+Cada tesela z/x/y contiene una capa 'municipios' con un punto por
+municipio y sus atributos (municipio, departamento, macro, alerta,
+codigo, count). En zooms bajos los puntos que caen en la misma celda de
+TILE_CONFIG['cell'] unidades se funden en uno con la peor alerta y el
+conteo, de modo que ninguna tesela crece sin límite.
+
+Las teselas se generan bajo demanda o por adelantado y se guardan en
+disco por versión de datos y filtros; las vacías no se guardan y los
+valores de filtro ausentes del dataset se descartan antes de formar la
+clave, de modo que peticiones arbitrarias no hacen crecer la caché:
+    python -m utils.tiles build --max-zoom 10
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+from .cache import ByteBudgetLRU
+from .clustering import TILE_SIZE, alert_order, mercator_pixels
+from .config import API_FILTER_PARAMS, CACHE_DIR, DATA_FILE, TILE_CONFIG
+from .data_loader import filter_data, get_data_version, get_filter_index
+from .filter_index import FILTER_COLUMNS
+
+LAYER_NAME = 'municipios'
+
+TILE_PROPERTIES = {
+    'municipio': 'Municipio',
+    'departamento': 'Departamento',
+    'macro': 'Macrorregion',
+    'alerta': 'Llamada a la acción',
+    'codigo': 'Codigo Divipola'
+}
+
+# --- Codificación protobuf mínima (esquema vector_tile.proto v2) ---
+
+_VARINT, _LENGTH = 0, 2
+_POINT = 1
+_MOVE_TO = 1
+
+
+def _varint(value: int, out: bytearray):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _key(field: int, wire_type: int, out: bytearray):
+    _varint((field << 3) | wire_type, out)
+
+
+def _message(field: int, payload: bytes, out: bytearray):
+    _key(field, _LENGTH, out)
+    _varint(len(payload), out)
+    out += payload
+
+
+def _packed(field: int, values, out: bytearray):
+    payload = bytearray()
+    for value in values:
+        _varint(value, payload)
+    _message(field, bytes(payload), out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _value(value) -> bytes:
+    """Mensaje Value: cadenas, enteros (sint) o decimales (double)"""
+    out = bytearray()
+    if isinstance(value, (bool, np.bool_)):
+        _key(7, _VARINT, out)
+        _varint(int(value), out)
+    elif isinstance(value, (int, np.integer)):
+        _key(6, _VARINT, out)
+        _varint(_zigzag(int(value)), out)
+    elif isinstance(value, (float, np.floating)):
+        _key(3, 1, out)
+        out += np.float64(value).tobytes()
+    else:
+        _message(1, str(value).encode('utf-8'), out)
+    return bytes(out)
+
+
+def encode_point_layer(name: str, x: np.ndarray, y: np.ndarray, attributes: dict,
+                       extent: int = TILE_CONFIG['extent']) -> bytes:
+    """
+    Capa MVT de puntos
+
+    Args:
+        name: Nombre de la capa
+        x, y: Coordenadas enteras dentro de la tesela (0..extent)
+        attributes: {nombre: lista de valores}, paralela a x e y; None se omite
+    """
+    keys = list(attributes)
+    values, value_ids = [], {}
+    layer = bytearray()
+    _key(15, _VARINT, layer)
+    _varint(2, layer)
+    _message(1, name.encode('utf-8'), layer)
+
+    columns = [attributes[k] for k in keys]
+    for i, (px, py) in enumerate(zip(x.tolist(), y.tolist())):
+        tags = []
+        for k, column in enumerate(columns):
+            value = column[i]
+            if value is None:
+                continue
+            vid = value_ids.get((type(value), value))
+            if vid is None:
+                vid = value_ids[(type(value), value)] = len(values)
+                values.append(value)
+            tags += (k, vid)
+
+        feature = bytearray()
+        _packed(2, tags, feature)
+        _key(3, _VARINT, feature)
+        _varint(_POINT, feature)
+        _packed(4, ((_MOVE_TO & 0x7) | (1 << 3), _zigzag(px), _zigzag(py)), feature)
+        _message(2, bytes(feature), layer)
+
+    for k in keys:
+        _message(3, k.encode('utf-8'), layer)
+    for value in values:
+        _message(4, _value(value), layer)
+    _key(5, _VARINT, layer)
+    _varint(extent, layer)
+
+    tile = bytearray()
+    _message(3, bytes(layer), tile)
+    return bytes(tile)
+
+
+# --- Recorte de teselas ---
+
+class TileSource:
+    """
+    Coordenadas Web Mercator normalizadas (0..1) y atributos de un dataset
+
+    Se calcula una vez por versión y filtros; cada tesela solo recorta y
+    codifica.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        lat = df['Latitud'].to_numpy(dtype=float)
+        lon = df['Longitud'].to_numpy(dtype=float)
+        mx, my = mercator_pixels(lat, lon, 0)
+        self.mx = mx / TILE_SIZE
+        self.my = my / TILE_SIZE
+        # Prioridad de la alerta (0 = más grave) para quedarse con la peor al fundir
+        self.priority = pd.Categorical(df['Llamada a la acción'], categories=alert_order()).codes
+        self.priority = np.where(self.priority < 0, len(alert_order()), self.priority)
+        self.columns = {
+            key: df[col].astype(object).where(df[col].notna(), None).to_numpy()
+            for key, col in TILE_PROPERTIES.items()
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return self.mx.nbytes * 3 + sum(col.nbytes for col in self.columns.values())
+
+    def bounds(self) -> tuple:
+        """Extremos normalizados (x0, y0, x1, y1) de los puntos"""
+        if len(self.mx) == 0:
+            return None
+        return self.mx.min(), self.my.min(), self.mx.max(), self.my.max()
+
+    def tile(self, z: int, x: int, y: int, extent: int = TILE_CONFIG['extent'],
+             buffer: int = TILE_CONFIG['buffer'], cell: int = TILE_CONFIG['cell']) -> bytes:
+        """Tesela MVT z/x/y codificada; b'' (tesela sin capas) si no tiene puntos"""
+        n = 2 ** z
+        lx = (self.mx * n - x) * extent
+        ly = (self.my * n - y) * extent
+        inside = np.flatnonzero((lx >= -buffer) & (lx < extent + buffer) &
+                                (ly >= -buffer) & (ly < extent + buffer))
+        if len(inside) == 0:
+            return b''
+
+        px = np.floor(lx[inside]).astype(np.int64)
+        py = np.floor(ly[inside]).astype(np.int64)
+
+        # Una entrada por celda: la de peor alerta, con el conteo de la celda
+        cells = (px // cell) * (extent * 4) + (py // cell)
+        order = np.lexsort((self.priority[inside], cells))
+        cells_sorted = cells[order]
+        first = np.flatnonzero(np.r_[len(order) > 0, cells_sorted[1:] != cells_sorted[:-1]])
+        counts = np.diff(np.r_[first, len(order)])
+        keep = order[first]
+
+        rows = inside[keep]
+        attributes = {key: column[rows].tolist() for key, column in self.columns.items()}
+        # Los puntos fundidos no representan a un municipio concreto
+        merged = counts > 1
+        for key in ('municipio', 'codigo'):
+            attributes[key] = [None if m else v for v, m in zip(attributes[key], merged.tolist())]
+        attributes['count'] = counts.tolist()
+
+        return encode_point_layer(LAYER_NAME, px[keep], py[keep], attributes, extent)
+
+    def tile_range(self, z: int) -> tuple:
+        """Teselas (x0, y0, x1, y1) que cubren los puntos en el zoom z"""
+        bounds = self.bounds()
+        if bounds is None:
+            return None
+        n = 2 ** z
+        x0, y0, x1, y1 = (min(n - 1, max(0, int(v * n))) for v in bounds)
+        return x0, y0, x1, y1
+
+
+# --- Caché de teselas ---
+
+_sources = ByteBudgetLRU(TILE_CONFIG['source_cache_bytes'], sizeof=lambda s: s.nbytes)
+
+
+def filter_query(filter_key: tuple) -> str:
+    """
+    Query string para una clave de filtros, con el parámetro repetido por
+    cada valor (?alerta=A&alerta=B), el formato que lee api.parse_filters
+    """
+    params = [(name, value) for name, values in zip(API_FILTER_PARAMS, filter_key) for value in values]
+    return f'?{urlencode(params)}' if params else ''
+
+
+def tile_in_range(z: int, x: int, y: int, max_zoom: int = TILE_CONFIG['max_native_zoom']) -> bool:
+    """Indica si z/x/y es una tesela válida que se sirve"""
+    return 0 <= z <= max_zoom and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def known_filter_key(df: pd.DataFrame, filter_key: tuple) -> tuple:
+    """
+    filter_key sin los valores que no aparecen en df
+
+    Returns:
+        La clave depurada, o None si algún filtro solo tenía valores
+        desconocidos (la selección es vacía)
+    """
+    bitmaps = get_filter_index(df).bitmaps
+    known = tuple(
+        tuple(value for value in values if value in bitmaps[col])
+        for col, values in zip(FILTER_COLUMNS, filter_key)
+    )
+    if any(values and not kept for values, kept in zip(filter_key, known)):
+        return None
+    return known
+
+
+def tile_cache_dir(data_version: str, filter_key: tuple, root: str = None) -> str:
+    root = root or os.path.join(CACHE_DIR, 'tiles')
+    digest = hashlib.sha1(repr(filter_key).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(root, data_version, digest)
+
+
+def _prune_versions(root: str, keep: str):
+    """Elimina las teselas de versiones de datos anteriores"""
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        if name != keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def get_tile_source(df: pd.DataFrame, filter_key: tuple = ((), (), ())) -> TileSource:
+    """Fuente de teselas para el dataset completo filtrado por filter_key"""
+    return _sources.get_or_create(
+        (get_data_version(df), filter_key),
+        lambda: TileSource(filter_data(df, *filter_key))
+    )
+
+
+def get_tile(df: pd.DataFrame, z: int, x: int, y: int,
+             filter_key: tuple = ((), (), ()), root: str = None) -> bytes:
+    """
+    Tesela MVT del dataset completo df con los filtros de filter_key
+
+    Se lee del disco si ya se generó para esta versión de datos; si no, se
+    genera y se guarda si tiene puntos. Las teselas de versiones anteriores
+    se descartan.
+    """
+    if not tile_in_range(z, x, y):
+        raise ValueError(f"Tesela fuera de rango: {z}/{x}/{y}")
+    filter_key = known_filter_key(df, filter_key)
+    if filter_key is None:
+        return b''
+
+    data_version = get_data_version(df)
+    root = root or os.path.join(CACHE_DIR, 'tiles')
+    path = os.path.join(tile_cache_dir(data_version, filter_key, root), str(z), str(x), f'{y}.pbf')
+    try:
+        with open(path, 'rb') as fh:
+            return fh.read()
+    except FileNotFoundError:
+        pass
+
+    data = get_tile_source(df, filter_key).tile(z, x, y)
+    if data and data_version:
+        if not os.path.isdir(os.path.join(root, data_version)):
+            _prune_versions(root, keep=data_version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    return data
+
+
+def build_tiles(df: pd.DataFrame, min_zoom: int = TILE_CONFIG['min_zoom'],
+                max_zoom: int = TILE_CONFIG['max_zoom'], filter_key: tuple = ((), (), ()),
+                root: str = None) -> int:
+    """Genera por adelantado las teselas que cubren los datos; devuelve cuántas"""
+    source = get_tile_source(df, filter_key)
+    total = 0
+    for z in range(min_zoom, max_zoom + 1):
+        tile_range = source.tile_range(z)
+        if tile_range is None:
+            break
+        x0, y0, x1, y1 = tile_range
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                get_tile(df, z, x, y, filter_key, root)
+                total += 1
+    return total
+
+
+def main(argv=None) -> int:
+    from .data_loader import read_electoral_data
+
+    parser = argparse.ArgumentParser(description="Teselas vectoriales de alertas")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Generar las teselas de la versión vigente')
+    build.add_argument('--data', default=DATA_FILE, help='Libro de Excel de origen')
+    build.add_argument('--min-zoom', type=int, default=TILE_CONFIG['min_zoom'])
+    build.add_argument('--max-zoom', type=int, default=TILE_CONFIG['max_zoom'])
+    args = parser.parse_args(argv)
+
+    df, _ = read_electoral_data(args.data)
+    total = build_tiles(df, args.min_zoom, args.max_zoom)
+    print(f"{total} teselas generadas para la versión {get_data_version(df)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())